@@ -0,0 +1,140 @@
+# micropython
+# MIT license
+"""Бенчмарк публичных методов драйвера TMP11X.
+
+Для каждого метода измеряет:
+    - количество обращений к шине (через обертку CountingAdapter вокруг BusAdapter);
+    - время вызова в мкс;
+    - объем выделенной памяти в байтах на вызов (только MicroPython: gc.mem_alloc при отключенной сборке мусора).
+      В CPython освобожденная память сразу используется повторно, а tracemalloc показывает лишь наибольший
+      объем занятой памяти, а не выделенные байты, поэтому столбец содержит n/a.
+
+По умолчанию работает с моделью датчика tmp11Xsim (на плате с MicroPython и на компьютере).
+Для измерений на реальном датчике передайте в run() адаптер реальной шины:
+    run(I2cAdapter(I2C(id=1, scl=Pin(7), sda=Pin(6), freq=400_000)))
+"""
+
+import gc
+import time
+from collections import namedtuple
+# tmp11Xsim импортируется первым: на компьютере он устанавливает заменители модулей MicroPython (tmp11Xhost)
+from tmp11Xsim import SimI2C, TMP11XSim
+import tmp11Xtimod
+from sensor_pack_2.bus_service import BusAdapter, I2cAdapter
+
+bench_result = namedtuple("bench_result", "name calls bus_ops us_per_call alloc_per_call")
+
+try:
+    _ticks_us = time.ticks_us
+    _ticks_diff = time.ticks_diff
+except AttributeError:
+    def _ticks_us() -> int:
+        return time.perf_counter_ns() // 1000
+
+    def _ticks_diff(end: int, start: int) -> int:
+        return end - start
+
+
+def _alloc_start():
+    """Начало подсчета выделенной памяти"""
+    gc.collect()
+    gc.disable()
+    return gc.mem_alloc() if hasattr(gc, "mem_alloc") else None
+
+
+def _alloc_stop(start: int | None) -> int | None:
+    """Окончание подсчета. Возвращает кол-во выделенных байт или None, если среда это не поддерживает"""
+    gc.enable()
+    if start is None:
+        return None
+    return gc.mem_alloc() - start
+
+
+class CountingAdapter(BusAdapter):
+    """Обертка над адаптером шины, считающая обращения к шине. Все вызовы передаются адаптеру adapter."""
+
+    def __init__(self, adapter: BusAdapter):
+        super().__init__(adapter.bus)
+        self._adapter = adapter
+        self.ops = 0
+
+    def read_register(self, device_addr, reg_addr, bytes_count):
+        self.ops += 1
+        return self._adapter.read_register(device_addr, reg_addr, bytes_count)
+
+    def write_register(self, device_addr, reg_addr, value, bytes_count, byte_order):
+        self.ops += 1
+        return self._adapter.write_register(device_addr, reg_addr, value, bytes_count, byte_order)
+
+    def read(self, device_addr, n_bytes):
+        self.ops += 1
+        return self._adapter.read(device_addr, n_bytes)
+
+    def read_to_buf(self, device_addr, buf):
+        self.ops += 1
+        return self._adapter.read_to_buf(device_addr, buf)
+
+    def write(self, device_addr, buf):
+        self.ops += 1
+        return self._adapter.write(device_addr, buf)
+
+    def read_buf_from_memory(self, device_addr, mem_addr, buf, address_size=1):
+        self.ops += 1
+        return self._adapter.read_buf_from_memory(device_addr, mem_addr, buf, address_size)
+
+    def write_buf_to_memory(self, device_addr, mem_addr, buf):
+        self.ops += 1
+        return self._adapter.write_buf_to_memory(device_addr, mem_addr, buf)
+
+
+def bench(name: str, func, adapter: CountingAdapter, repeats: int = 100) -> bench_result:
+    """Вызывает func() repeats раз. Возвращает средние значения на один вызов"""
+    func()  # прогрев
+    adapter.ops = 0
+    start = _ticks_us()
+    for _ in range(repeats):
+        func()
+    elapsed = _ticks_diff(_ticks_us(), start)
+    # память считается отдельным проходом, чтобы отключение сборки мусора не искажало время
+    ops = adapter.ops
+    alloc = _alloc_start()
+    for _ in range(repeats):
+        func()
+    alloc = _alloc_stop(alloc)
+    return bench_result(name=name, calls=repeats, bus_ops=ops / repeats, us_per_call=elapsed / repeats,
+                        alloc_per_call=None if alloc is None else alloc / repeats)
+
+
+def run(adapter: BusAdapter, repeats: int = 100) -> list:
+    """Выполняет бенчмарк всех методов. Возвращает список bench_result"""
+    counting = CountingAdapter(adapter)
+    ts = tmp11Xtimod.TMP11X(counting)
+    flags = tmp11Xtimod.TMP11XFlags()
+    cases = (
+        ("get_measurement_value", ts.get_measurement_value),
+        ("get_flags", ts.get_flags),
+        ("read_status", lambda: ts.read_status(flags)),
+        ("is_over_threshold", ts.is_over_threshold),
+        ("set_thresholds", lambda: ts.set_thresholds((20.0, 30.0))),
+        ("get_uid", ts.get_uid),
+        ("start_measurement", ts.start_measurement),
+        ("get_conversion_cycle_time", ts.get_conversion_cycle_time),
+    )
+    return [bench(name, func, counting, repeats) for name, func in cases]
+
+
+def print_results(results: list):
+    print(f"{'method':<26} | {'bus ops':>7} | {'us/call':>9} | {'bytes/call':>10}")
+    print(62 * "-")
+    for r in results:
+        alloc = "n/a" if r.alloc_per_call is None else f"{r.alloc_per_call:.1f}"
+        print(f"{r.name:<26} | {r.bus_ops:>7.2f} | {r.us_per_call:>9.1f} | {alloc:>10}")
+
+
+if __name__ == '__main__':
+    bus = SimI2C(freq=400_000)
+    bus.add_device(TMP11XSim(address=0x48, temperature=25.0))
+    # ожидание загрузки EEPROM после "включения питания"
+    bus.sleep_ms(2)
+    print_results(run(I2cAdapter(bus)))
+    print(f"\nsimulated bus: {bus.transactions} transactions, {bus.bus_time_us} us on the wire")
@@ -2,69 +2,14 @@
 import time
 import tmp11Xtimod
 from machine import I2C, Pin
-from collections import namedtuple
 from micropython import const
 from sensor_pack_2.bus_service import I2cAdapter
 from sensor_pack_2.comp_interface import CompMode
+from sensor_pack_2.stats import StreamStats
 
 AVG_64: int = const(3)           # AVG[1:0] = 0b11 -> 64 усреднения
 CONV_CYCLE_1S: int = const(4)    # CONV[2:0] = 0b100 -> 1 секунда
 
-# Тип для возвращаемого результата
-stats_result = namedtuple("stats_result", "count min max avg median range std_dev")
-
-def calc_stats(samples: list[float]) -> stats_result | None:
-    """
-    Вычисляет базовую статистику по списку измерений температуры.
-
-    Аргументы:
-        samples (list[float]): Список измерений температуры в °C.
-
-    Возвращает:
-        stats_result: Именованный кортеж с полями:
-            - count: количество измерений
-            - min: минимальное значение
-            - max: максимальное значение
-            - avg: среднее арифметическое
-            - median: медиана
-            - range: размах (max - min)
-            - std_dev: стандартное отклонение (выборочное)
-        None: Если список пуст.
-    """
-    n = len(samples)
-    if 0 == n:
-        return None
-
-    # Сортировка для медианы
-    sorted_samples = sorted(samples)
-
-    # Основные метрики
-    min_val: float = sorted_samples[0]
-    max_val: float = sorted_samples[-1]
-    avg_val: float = sum(samples) / n
-    range_val: float = max_val - min_val
-
-    # Медиана
-    if 0 == n % 2:
-        median_val: float = (sorted_samples[n // 2 - 1] + sorted_samples[n // 2]) / 2
-    else:
-        median_val: float = sorted_samples[n // 2]
-
-    # Стандартное отклонение (формула стандартного отклонения)
-    variance: float = sum((x - avg_val) ** 2 for x in samples) / (n - 1)
-    std_dev: float = variance ** 0.5
-
-    return stats_result(
-        count=n,
-        min=min_val,
-        max=max_val,
-        avg=avg_val,
-        median=median_val,
-        range=range_val,
-        std_dev=std_dev
-    )
-
-
 if __name__ == '__main__':
     # пожалуйста установите выводы scl и sda в конструкторе для вашей платы, иначе ничего не заработает!
     # please set scl and sda pins for your board, otherwise nothing will work!
@@ -130,14 +75,15 @@ if __name__ == '__main__':
     _lim = 40
     _min_old = float("inf")
     _max_old = float("-inf")
-    samples: list[float] = []
+    # статистика обновляется каждым отсчетом, сами отсчеты не хранятся
+    stream_stats = StreamStats(resolution=ts.RESOLUTION)
     for i, val in enumerate(ts):
         if i >= _lim:
             break
         time.sleep_ms(sleep_time)
         if val is None:
             continue
-        samples.append(val)
+        stream_stats.add(val)
 
         _min = min(val, _min_old)
         _max = max(val, _max_old)
@@ -146,7 +92,7 @@ if __name__ == '__main__':
         _max_old = _max
 
     # Расчёт статистики
-    stats = calc_stats(samples)
+    stats = stream_stats.result()
 
     if stats is not None:
         print(f"\nСтатистика ({stats.count} измерений):")
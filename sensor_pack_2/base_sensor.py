@@ -6,6 +6,10 @@ import micropython
 from sensor_pack_2 import bus_service
 from machine import Pin
 
+# заранее созданные кортежи порядка байт. _get_byteorder_as_str не выделяет память при каждом вызове!
+_BYTEORDER_BIG = 'big', '>'
+_BYTEORDER_LITTLE = 'little', '<'
+
 @micropython.native
 def check_value(value: int | None,
                 valid_range: range | tuple,
@@ -36,6 +40,30 @@ def check_value(value: int | None,
 
     return value
 
+@micropython.native
+def check_range(value: int | None, valid_range: range | tuple, val_name: str) -> int | None:
+    """
+    Проверка целочисленного значения в допустимом диапазоне без лишних затрат.
+    В отличие от check_value, сообщение об ошибке формируется (get_error_str) только при ошибке,
+    поэтому успешная проверка не выделяет память. Диапазон valid_range создавайте один раз, заранее!
+
+    Аргументы:
+        value (int | None): Проверяемое целое значение.
+        valid_range (range | tuple): Допустимый диапазон или список дискретных значений.
+        val_name (str): Имя параметра для сообщения об ошибке.
+
+    Возвращает:
+        int | None: Проверенное значение, или None если value is None.
+
+    Raises:
+        ValueError: Если значение выходит за пределы диапазона.
+    """
+    if value is None:
+        return value
+    if value not in valid_range:
+        raise ValueError(get_error_str(val_name, value, valid_range))
+    return value
+
 @micropython.native
 def check_value_ex(value: int | float | None,
                    valid_range: range | tuple[int, int] | tuple[float, float] | None,
@@ -136,8 +164,8 @@ class Device:
     def _get_byteorder_as_str(self) -> tuple:
         """Return byteorder as string"""
         if self.is_big_byteorder():
-            return 'big', '>'
-        return 'little', '<'
+            return _BYTEORDER_BIG
+        return _BYTEORDER_LITTLE
 
     def pack(self, fmt_char: str, *values) -> bytes:
         if not fmt_char:
@@ -188,6 +216,44 @@ class DeviceEx(Device):
         """Запись регистра разрядностью 16 бит"""
         self.write_reg(address, value, 2)
 
+    @micropython.native
+    def read_reg_16_into(self, reg_addr: int, buf: bytearray, signed: bool = False) -> int:
+        """Быстрое чтение регистра разрядностью 16 бит в заранее выделенный буфер buf (2 байта).
+        Значение декодируется прямо из buf, без struct.unpack, строки формата и кортежа.
+        Для частого опроса датчика, когда важно не выделять память (нет пауз сборщика мусора)."""
+        self.adapter.read_buf_from_memory(self.address, reg_addr, buf, 1)
+        if self.big_byte_order:
+            val = (buf[0] << 8) | buf[1]
+        else:
+            val = (buf[1] << 8) | buf[0]
+        if signed and val & 0x8000:
+            return val - 0x10000
+        return val
+
+    @micropython.native
+    def write_reg_16_from(self, reg_addr: int, value: int, buf: bytearray):
+        """Быстрая запись регистра разрядностью 16 бит через заранее выделенный буфер buf (2 байта).
+        В отличие от write_reg, не вызывает int.to_bytes и не выделяет память."""
+        value &= 0xFFFF
+        if self.big_byte_order:
+            buf[0] = value >> 8
+            buf[1] = value & 0xFF
+        else:
+            buf[0] = value & 0xFF
+            buf[1] = value >> 8
+        return self.adapter.write_buf_to_memory(self.address, reg_addr, buf)
+
+    def read_regs_16_into(self, reg_addrs, buf: bytearray, out):
+        """Пакетное чтение нескольких регистров разрядностью 16 бит, каждый регистр - отдельной транзакцией
+        (указатель регистра TMP11X при чтении не увеличивается). Память не выделяется.
+        reg_addrs - адреса регистров (tuple, list, array);
+        buf - заранее выделенный буфер (2 байта);
+        out - заранее выделенный массив/список не менее len(reg_addrs) элементов для беззнаковых значений.
+        Возвращает out."""
+        for i in range(len(reg_addrs)):
+            out[i] = self.read_reg_16_into(reg_addrs[i], buf, False)
+        return out
+
     def read(self, n_bytes: int) -> bytes:
         """Читает из устройства n_bytes байт. Добавил 25.01.2024"""
         return self.adapter.read(self.address, n_bytes)
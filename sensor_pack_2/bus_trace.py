@@ -0,0 +1,197 @@
+# micropython
+# MIT license
+"""Трассировка и профилирование обращений к шине I2C.
+
+TracingI2cAdapter - адаптер шины I2C (наследник I2cAdapter), который, кроме обмена данными, записывает каждую
+транзакцию в BusTracer: адрес устройства, регистр, направление, количество байт, длительность в мкс и ошибку.
+BusTracer хранит:
+    - последние capacity транзакций в кольцевом буфере из массивов array (память выделяется один раз);
+    - счетчики по каждому регистру каждого устройства: чтения, записи, ошибки, байты, суммарное и
+      наибольшее время, гистограмму длительностей по степеням двойки (интервал k: от 2**(k-1) до 2**k - 1 мкс).
+По счетчикам легко найти лишние обращения (например, повторные чтения регистра конфигурации),
+а по длительностям - конкуренцию за шину (растягивание такта, другие устройства).
+
+Когда трассировка не нужна, драйвер получает обычный I2cAdapter, и дополнительных затрат нет вовсе.
+Временно отключить запись можно свойством BusTracer.enabled.
+
+Пример:
+    tracer = BusTracer(capacity=64)
+    sensor = TMP11X(TracingI2cAdapter(i2c, tracer))
+    ...
+    tracer.print_summary()
+"""
+
+import time
+import micropython
+from array import array
+from collections import namedtuple
+from machine import I2C
+from sensor_pack_2.bus_service import I2cAdapter
+
+# Типы для возвращаемых результатов
+trace_record = namedtuple("trace_record", "ticks_us address reg write length duration_us error")
+reg_stats = namedtuple("reg_stats", "address reg reads writes errors bytes total_us max_us hist")
+
+# количество интервалов гистограммы длительностей
+HIST_BINS = 16
+# регистр не указан (обмен без адреса регистра: read, write)
+NO_REG = -1
+# индексы счетчиков регистра
+_READS = 0
+_WRITES = 1
+_ERRORS = 2
+_BYTES = 3
+_TOTAL_US = 4
+_MAX_US = 5
+_HIST = 6
+
+
+@micropython.native
+def _hist_bin(duration_us: int) -> int:
+    """Номер интервала гистограммы: количество значащих бит длительности, не более HIST_BINS - 1"""
+    k = 0
+    while duration_us and k < HIST_BINS - 1:
+        duration_us >>= 1
+        k += 1
+    return k
+
+
+class BusTracer:
+    """Журнал транзакций шины фиксированного размера и счетчики по регистрам"""
+
+    def __init__(self, capacity: int = 64):
+        """capacity - количество последних транзакций, хранимых в кольцевом буфере"""
+        if capacity < 1:
+            raise ValueError(f"Неверное значение capacity: {capacity}")
+        self._capacity = capacity
+        self._ticks = array("I", bytes(4 * capacity))
+        self._dur = array("I", bytes(4 * capacity))
+        self._reg = array("h", bytes(2 * capacity))
+        self._len = array("H", bytes(2 * capacity))
+        self._addr = bytearray(capacity)
+        # бит 0 - запись, бит 1 - ошибка
+        self._flags = bytearray(capacity)
+        self._wr = 0
+        # общее количество записанных транзакций
+        self.count = 0
+        # счетчики регистров: ключ (адрес устройства << 16) | (регистр & 0xFFFF), значение - array('I')
+        self._regs = dict()
+        self.enabled = True
+
+    def clear(self):
+        """Сбрасывает журнал и все счетчики"""
+        self._wr = 0
+        self.count = 0
+        self._regs = dict()
+
+    @micropython.native
+    def record(self, ticks_us: int, address: int, reg: int, write: bool, length: int, duration_us: int,
+               error: bool = False):
+        """Записывает транзакцию. Память выделяется только при первом обращении к новому регистру."""
+        if not self.enabled:
+            return
+        wr = self._wr
+        self._ticks[wr] = ticks_us
+        self._dur[wr] = duration_us
+        self._reg[wr] = reg
+        self._len[wr] = length
+        self._addr[wr] = address
+        self._flags[wr] = (1 if write else 0) | (2 if error else 0)
+        wr += 1
+        if wr == self._capacity:
+            wr = 0
+        self._wr = wr
+        self.count += 1
+        key = (address << 16) | (reg & 0xFFFF)
+        c = self._regs.get(key)
+        if c is None:
+            c = array("I", bytes(4 * (_HIST + HIST_BINS)))
+            self._regs[key] = c
+        c[_WRITES if write else _READS] += 1
+        if error:
+            c[_ERRORS] += 1
+        c[_BYTES] += length
+        c[_TOTAL_US] += duration_us
+        if duration_us > c[_MAX_US]:
+            c[_MAX_US] = duration_us
+        c[_HIST + _hist_bin(duration_us)] += 1
+
+    def __len__(self) -> int:
+        """Количество транзакций в кольцевом буфере"""
+        return self.count if self.count < self._capacity else self._capacity
+
+    def records(self):
+        """Генератор транзакций (trace_record) из кольцевого буфера, от старых к новым"""
+        n = len(self)
+        cap = self._capacity
+        for i in range(n):
+            k = self._wr - n + i
+            if k < 0:
+                k += cap
+            flags = self._flags[k]
+            yield trace_record(ticks_us=self._ticks[k], address=self._addr[k], reg=self._reg[k],
+                               write=bool(flags & 1), length=self._len[k], duration_us=self._dur[k],
+                               error=bool(flags & 2))
+
+    def register_stats(self):
+        """Генератор счетчиков (reg_stats) по регистрам, в порядке адреса устройства и регистра"""
+        for key in sorted(self._regs):
+            c = self._regs[key]
+            reg = key & 0xFFFF
+            yield reg_stats(address=key >> 16, reg=reg - 0x10000 if reg & 0x8000 else reg,
+                            reads=c[_READS], writes=c[_WRITES], errors=c[_ERRORS], bytes=c[_BYTES],
+                            total_us=c[_TOTAL_US], max_us=c[_MAX_US], hist=c[_HIST:])
+
+    def print_summary(self):
+        """Выводит счетчики по регистрам"""
+        print(f"Транзакций: {self.count}")
+        for s in self.register_stats():
+            reg = "-" if NO_REG == s.reg else f"0x{s.reg:02X}"
+            avg = s.total_us // (s.reads + s.writes)
+            print(f"0x{s.address:02X} {reg}: чтений {s.reads}, записей {s.writes}, ошибок {s.errors}, "
+                  f"байт {s.bytes}, среднее {avg} мкс, наибольшее {s.max_us} мкс")
+
+
+class TracingI2cAdapter(I2cAdapter):
+    """Адаптер шины I2C, записывающий каждую транзакцию в BusTracer"""
+
+    def __init__(self, bus: I2C, tracer: BusTracer):
+        super().__init__(bus)
+        self.tracer = tracer
+
+    def _call(self, address: int, reg: int, write: bool, length: int, func, *args):
+        """Вызывает func(*args) и записывает транзакцию. Ошибка шины записывается и возбуждается повторно"""
+        start = time.ticks_us()
+        try:
+            result = func(*args)
+        except OSError:
+            self.tracer.record(start, address, reg, write, length, time.ticks_diff(time.ticks_us(), start), True)
+            raise
+        self.tracer.record(start, address, reg, write, length, time.ticks_diff(time.ticks_us(), start))
+        return result
+
+    def write_register(self, device_addr: int, reg_addr: int, value: int | bytes | bytearray | memoryview,
+                       bytes_count: int, byte_order: str):
+        return self._call(device_addr, reg_addr, True, bytes_count, super().write_register,
+                          device_addr, reg_addr, value, bytes_count, byte_order)
+
+    def read_register(self, device_addr: int, reg_addr: int, bytes_count: int) -> bytes:
+        return self._call(device_addr, reg_addr, False, bytes_count, super().read_register,
+                          device_addr, reg_addr, bytes_count)
+
+    def read(self, device_addr: int, n_bytes: int) -> bytes:
+        return self._call(device_addr, NO_REG, False, n_bytes, super().read, device_addr, n_bytes)
+
+    def read_to_buf(self, device_addr: int, buf: bytearray | memoryview) -> bytes:
+        return self._call(device_addr, NO_REG, False, len(buf), super().read_to_buf, device_addr, buf)
+
+    def write(self, device_addr: int, buf: bytes | bytearray | memoryview):
+        return self._call(device_addr, NO_REG, True, len(buf), super().write, device_addr, buf)
+
+    def read_buf_from_memory(self, device_addr: int, mem_addr, buf: bytearray | memoryview, address_size: int = 1):
+        return self._call(device_addr, mem_addr, False, len(buf), super().read_buf_from_memory,
+                          device_addr, mem_addr, buf, address_size)
+
+    def write_buf_to_memory(self, device_addr: int, mem_addr, buf: bytes | bytearray | memoryview):
+        return self._call(device_addr, mem_addr, True, len(buf), super().write_buf_to_memory,
+                          device_addr, mem_addr, buf)
@@ -0,0 +1,154 @@
+# micropython
+# MIT license
+"""Обработка сигнала датчика по прерыванию: прерывание -> micropython.schedule -> очередь без блокировок.
+
+IrqQueue - базовый класс для модулей, которые по фронту сигнала на выводе MCU (например, ALERT датчика)
+читают датчик и складывают результаты в очередь:
+    - обработчик прерывания запоминает время (time.ticks_us) и планирует обработку через micropython.schedule.
+      Шина в прерывании не используется, память не выделяется;
+    - запланированный обработчик вызывает метод _process(ticks) наследника, который читает датчик и добавляет
+      результаты в очередь методом _push(value, ticks);
+    - основной код забирает результаты методом _read. Очередь (capacity - 1 элементов) без блокировок:
+      обработчик изменяет только индекс записи, основной код - только индекс чтения.
+
+Пропущенная обработка: если очередь micropython.schedule переполнена (счетчик missed), датчик не прочитан
+и его сигнал остается в активном состоянии, поэтому нового фронта (и прерывания) не будет. Такую обработку
+нужно выполнить обязательно: available и _read сначала проверяют вывод, и если он активен, а обработка
+не запланирована, вызывают _process сразу (с временем проверки вместо времени прерывания).
+Запланированная обработка, к началу которой сигнал уже снят (датчик прочитан раньше), пропускается
+(счетчик spurious).
+"""
+
+import time
+import micropython
+from array import array
+from machine import Pin
+
+# буфер для сообщения об исключении в обработчике прерывания
+micropython.alloc_emergency_exception_buf(100)
+
+
+class IrqQueue:
+    """Прерывание по фронту сигнала, запланированная обработка и очередь пар (значение int16, время в мкс).
+
+    Счетчики: missed - очередь micropython.schedule была переполнена, overruns - очередь была заполнена
+    и значение отброшено, spurious - к началу обработки сигнал уже не был активен."""
+
+    def __init__(self, pin: Pin, capacity: int = 64, active_high: bool = False, hard: bool = True):
+        """pin - вывод MCU, к которому подключен сигнал (открытый сток, нужен подтягивающий резистор!);
+        capacity - размер очереди;
+        active_high - активный уровень сигнала. False - активный низкий уровень;
+        hard - использовать "жесткое" прерывание, если порт MicroPython его поддерживает."""
+        if capacity < 2:
+            raise ValueError(f"Неверное значение capacity: {capacity}")
+        self._pin = pin
+        self._active_high = active_high
+        self._hard = hard
+        self._capacity = capacity
+        # значения и время прерывания в мкс
+        self._values = array("h", capacity * [0])
+        self._ticks = array("I", capacity * [0])
+        # индекс записи изменяет только производитель, индекс чтения - только потребитель
+        self._wr = 0
+        self._rd = 0
+        # время последнего прерывания
+        self._irq_ticks = 0
+        # ссылки на связанные методы создаются один раз: в прерывании нельзя выделять память!
+        self._irq_ref = self._irq
+        self._run_ref = self._run
+        # Истина, если обработка запланирована и еще не выполнена
+        self._pending = False
+        self.missed = 0
+        self.overruns = 0
+        self.spurious = 0
+
+    def _attach(self):
+        """Подключает обработчик прерывания к фронту перехода сигнала в активное состояние"""
+        trigger = Pin.IRQ_RISING if self._active_high else Pin.IRQ_FALLING
+        try:
+            self._pin.irq(handler=self._irq_ref, trigger=trigger, hard=self._hard)
+        except TypeError:
+            # порт не поддерживает аргумент hard
+            self._pin.irq(handler=self._irq_ref, trigger=trigger)
+
+    def _detach(self):
+        """Отключает обработчик прерывания"""
+        self._pin.irq(handler=None)
+
+    def _active(self) -> bool:
+        """Истина, если сигнал в активном состоянии"""
+        return self._pin.value() == self._active_high
+
+    def _irq(self, pin):
+        """Обработчик прерывания. Шина не используется, память не выделяется!"""
+        self._irq_ticks = time.ticks_us()
+        self._pending = True
+        try:
+            micropython.schedule(self._run_ref, 1)
+        except RuntimeError:
+            # очередь запланированных функций переполнена: обработку выполнит _drain
+            self._pending = False
+            self.missed += 1
+
+    def _run(self, scheduled: int):
+        """Вызывает _process. scheduled - Истина для запланированного вызова"""
+        self._pending = False
+        if scheduled and not self._active():
+            self.spurious += 1
+            return
+        self._process(self._irq_ticks)
+
+    def _drain(self):
+        """Выполняет обработку, если сигнал активен, а обработка не запланирована (пропущенное прерывание)"""
+        if self._pending or not self._active():
+            return
+        self._irq_ticks = time.ticks_us()
+        self._run(0)
+
+    def _process(self, ticks: int):
+        """Чтение датчика после прерывания, время которого ticks. Должен снять сигнал (например, чтением
+        регистра) и добавить результаты методом _push. Вызывается вне прерывания: можно обращаться к шине."""
+        raise NotImplementedError
+
+    def _push(self, value: int, ticks: int) -> bool:
+        """Добавляет пару в очередь. Возвращает Ложь, если очередь заполнена и пара отброшена"""
+        wr = self._wr
+        nxt = wr + 1
+        if nxt == self._capacity:
+            nxt = 0
+        if nxt == self._rd:
+            self.overruns += 1
+            return False
+        self._values[wr] = value
+        self._ticks[wr] = ticks
+        self._wr = nxt
+        return True
+
+    def available(self) -> int:
+        """Количество элементов в очереди"""
+        self._drain()
+        n = self._wr - self._rd
+        return n if n >= 0 else n + self._capacity
+
+    def _read(self, values, ticks) -> int:
+        """Переносит элементы очереди: значения в values, время прерывания в ticks (любой из них может быть None).
+        Возвращает количество перенесенных элементов."""
+        self._drain()
+        rd = self._rd
+        wr = self._wr
+        n = 0
+        lim = len(values) if values is not None else len(ticks)
+        if values is not None and ticks is not None and len(ticks) < lim:
+            lim = len(ticks)
+        cap = self._capacity
+        while rd != wr and n < lim:
+            if values is not None:
+                values[n] = self._values[rd]
+            if ticks is not None:
+                ticks[n] = self._ticks[rd]
+            n += 1
+            rd += 1
+            if rd == cap:
+                rd = 0
+        self._rd = rd
+        return n
@@ -0,0 +1,138 @@
+# micropython
+# MIT license
+"""Кольцевой буфер отсчетов фиксированной емкости на основе array.
+
+Хранит сырые (raw) значения регистров датчика как int16 (array('h')), 2 байта на отсчет,
+и, при необходимости, время отсчета как uint32 (array('I')), еще 4 байта на отсчет.
+Преобразование в физические единицы (например °C) выполняется только при обращении к отсчету.
+Для сравнения: объект float в куче MicroPython занимает 16 и более байт плюс ссылка в списке.
+
+Массивы создаются без временного буфера bytes такого же размера (см. zero_array), поэтому при создании
+нужна только память самого буфера: 6 байт на отсчет с метками времени, 2 байта без них (RP2040: 264 КБ ОЗУ
+на все). Большой буфер
+лучше создавать в начале программы, пока куча не фрагментирована.
+
+Пример:
+    ring = SampleRing(14_400, timestamps=True, scale=TMP11X.RESOLUTION)    # 4 часа отсчетов раз в секунду, ~84 КБ
+    ring.append(sensor.get_measurement_raw(), time.ticks_ms())
+    print(ring.get(-1), ring.get_ticks(-1))     # последний отсчет в °C и его время
+"""
+
+import micropython
+from array import array
+
+# размер элемента массива в байтах для типов, используемых в пакете
+_ITEM_SIZE = {"b": 1, "B": 1, "h": 2, "H": 2, "i": 4, "I": 4, "l": 4, "L": 4, "f": 4}
+
+
+def zero_array(typecode: str, n: int) -> array:
+    """Массив из n нулей. Повторение массива из одного элемента (array * n) выделяет память только под результат.
+    Если порт MicroPython не поддерживает умножение массива, используется array(typecode, bytes(...)):
+    в этом случае при создании временно занято вдвое больше памяти, чем размер массива."""
+    try:
+        return array(typecode, (0,)) * n
+    except TypeError:
+        return array(typecode, bytes(_ITEM_SIZE[typecode] * n))
+
+
+class SampleRing:
+    """Кольцевой буфер сырых отсчетов int16 с необязательными метками времени uint32.
+    При заполнении новый отсчет затирает самый старый (счетчик dropped)."""
+
+    def __init__(self, capacity: int, timestamps: bool = False, scale: float = 1.0, invalid: int | None = None):
+        """capacity - емкость буфера в отсчетах;
+        timestamps - если Истина, хранить метку времени для каждого отсчета;
+        scale - коэффициент преобразования raw-значения в физическую величину;
+        invalid - raw-значение, означающее отсутствие данных (append его не сохраняет), или None."""
+        if capacity < 1:
+            raise ValueError(f"Неверное значение capacity: {capacity}")
+        self._capacity = capacity
+        self._raw = zero_array("h", capacity)
+        self._ticks = zero_array("I", capacity) if timestamps else None
+        self.scale = scale
+        self.invalid = invalid
+        # индекс следующей записи и количество отсчетов в буфере
+        self._wr = 0
+        self._count = 0
+        # количество затертых отсчетов
+        self.dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        self._wr = self._count = 0
+
+    @micropython.native
+    def append(self, raw: int, ticks: int = 0) -> bool:
+        """Добавляет отсчет. Возвращает Ложь, если raw равно invalid и отсчет не сохранен"""
+        if raw == self.invalid:
+            return False
+        wr = self._wr
+        self._raw[wr] = raw
+        if self._ticks is not None:
+            self._ticks[wr] = ticks
+        wr += 1
+        if wr == self._capacity:
+            wr = 0
+        self._wr = wr
+        if self._count < self._capacity:
+            self._count += 1
+        else:
+            self.dropped += 1
+        return True
+
+    @micropython.native
+    def _index(self, i: int) -> int:
+        """Преобразует номер отсчета (0 - самый старый, -1 - самый новый) в индекс массива"""
+        n = self._count
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError("SampleRing index out of range")
+        i += self._wr - n
+        if i < 0:
+            i += self._capacity
+        return i
+
+    def get_raw(self, i: int) -> int:
+        """Сырое значение отсчета номер i (0 - самый старый, -1 - самый новый)"""
+        return self._raw[self._index(i)]
+
+    def get(self, i: int) -> float:
+        """Значение отсчета номер i в физических единицах (raw * scale)"""
+        return self.scale * self._raw[self._index(i)]
+
+    def get_ticks(self, i: int) -> int:
+        """Метка времени отсчета номер i"""
+        if self._ticks is None:
+            raise ValueError("Метки времени не хранятся!")
+        return self._ticks[self._index(i)]
+
+    def __getitem__(self, i: int) -> float:
+        return self.get(i)
+
+    def raw_values(self):
+        """Генератор сырых значений, от старых к новым"""
+        for i in range(self._count):
+            yield self._raw[self._index(i)]
+
+    def values(self):
+        """Генератор значений в физических единицах, от старых к новым"""
+        scale = self.scale
+        for raw in self.raw_values():
+            yield scale * raw
+
+    def copy_raw_into(self, dst: array, start: int = 0) -> int:
+        """Копирует сырые значения, начиная с отсчета номер start, в dst (от старых к новым).
+        Возвращает количество скопированных отсчетов."""
+        n = self._count - start
+        if n > len(dst):
+            n = len(dst)
+        for k in range(n):
+            dst[k] = self._raw[self._index(start + k)]
+        return n if n > 0 else 0
@@ -0,0 +1,260 @@
+# micropython
+# MIT license
+"""Потоковая (инкрементальная) статистика измерений.
+
+StreamStats обновляется каждым отсчетом за постоянное время и использует постоянный объем памяти,
+поэтому позволяет получать статистику по миллионам отсчетов без их хранения:
+    - среднее и дисперсия по алгоритму Уэлфорда (Welford);
+    - минимум, максимум, размах;
+    - приближенная медиана по гистограмме фиксированного размера с шириной интервала,
+      кратной разрешению датчика (для TMP117/TMP119: 7.8125 m°C). Если все отсчеты попадают в гистограмму,
+      а ширина интервала равна разрешению датчика, медиана вычисляется точно.
+
+RawStreamStats - то же для целочисленных raw-значений датчика (например, TMP11X.get_measurement_raw):
+сумма и сумма квадратов отклонений от первого отсчета блока хранятся как малые целые числа MicroPython
+(не более 2**30 - 1, без выделения памяти). Перед переполнением блок объединяется с накопленной статистикой
+(формула Чана), только в этот момент и при расчете результата используется float. Подходит для портов без
+аппаратной поддержки float.
+
+Модуль не зависит от machine и micropython и может использоваться на компьютере.
+
+Пример:
+    st = StreamStats(resolution=TMP11X.RESOLUTION)
+    for val in sensor:
+        st.add(val)
+    print(st.result())
+"""
+
+from array import array
+from collections import namedtuple
+from sensor_pack_2.ring_buffer import zero_array
+
+# Тип для возвращаемого результата
+stats_result = namedtuple("stats_result", "count min max avg median range std_dev")
+# наибольшая сумма квадратов отклонений блока RawStreamStats: наибольшее малое целое MicroPython
+_SUM_SQ_LIMIT = 0x3FFF_FFFF
+
+
+def _hist_median(hist: array, n: int) -> tuple:
+    """Возвращает индексы интервалов гистограммы hist, содержащих нижнюю и верхнюю медиану n отсчетов"""
+    lo_rank = (n - 1) // 2
+    hi_rank = n // 2
+    lo = hi = None
+    acc = 0
+    for k in range(len(hist)):
+        acc += hist[k]
+        if lo is None and acc > lo_rank:
+            lo = k
+        if acc > hi_rank:
+            hi = k
+            break
+    return lo, hi
+
+
+class StreamStats:
+    """Накопитель потоковой статистики."""
+
+    def __init__(self, resolution: float = 7.8125E-3, bins: int = 1024, bin_width: int = 1):
+        """resolution - разрешение (цена младшего разряда) измеряемой величины;
+        bins - количество интервалов гистограммы медианы (по 4 байта);
+        bin_width - ширина интервала гистограммы в единицах resolution.
+        Гистограмма центрируется на первом отсчете и покрывает +/- bins * bin_width * resolution / 2.
+        Отсчеты вне гистограммы учитываются в крайних интервалах (медиана становится приближенной)."""
+        if bins < 2 or bin_width < 1:
+            raise ValueError(f"Неверные параметры гистограммы: bins={bins}, bin_width={bin_width}")
+        self.resolution = resolution
+        self._bin_width = bin_width
+        self._hist = zero_array("I", bins)
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает накопленную статистику"""
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._origin = 0.0
+        # количество отсчетов, не поместившихся в гистограмму
+        self.clipped = 0
+        hist = self._hist
+        for i in range(len(hist)):
+            hist[i] = 0
+
+    def add(self, value: float):
+        """Добавляет отсчет. Постоянное время и память."""
+        n = self.count + 1
+        self.count = n
+        # Welford
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        # гистограмма для медианы
+        if 1 == n:
+            self._origin = value
+        hist = self._hist
+        nbins = len(hist)
+        k = round((value - self._origin) / self.resolution) // self._bin_width + nbins // 2
+        if k < 0:
+            k = 0
+            self.clipped += 1
+        elif k >= nbins:
+            k = nbins - 1
+            self.clipped += 1
+        hist[k] += 1
+
+    @property
+    def avg(self) -> float:
+        return self._mean
+
+    @property
+    def variance(self) -> float:
+        """Выборочная (несмещенная) дисперсия"""
+        n = self.count
+        return self._m2 / (n - 1) if n > 1 else 0.0
+
+    @property
+    def std_dev(self) -> float:
+        """Выборочное стандартное отклонение"""
+        return self.variance ** 0.5
+
+    def _bin_value(self, k: int) -> float:
+        """Значение, соответствующее центру интервала k гистограммы"""
+        w = self._bin_width
+        offset = (k - len(self._hist) // 2) * w + (w - 1) / 2
+        return self._origin + offset * self.resolution
+
+    @property
+    def median(self) -> float | None:
+        """Медиана по гистограмме. O(bins), вызывайте только при необходимости."""
+        n = self.count
+        if 0 == n:
+            return None
+        lo, hi = _hist_median(self._hist, n)
+        return (self._bin_value(lo) + self._bin_value(hi)) / 2
+
+    def result(self) -> stats_result | None:
+        """Возвращает статистику или None, если отсчетов нет"""
+        n = self.count
+        if 0 == n:
+            return None
+        return stats_result(count=n, min=self.min, max=self.max, avg=self._mean, median=self.median,
+                            range=self.max - self.min, std_dev=self.std_dev)
+
+
+class RawStreamStats:
+    """Накопитель потоковой статистики целочисленных raw-значений. Обновление отсчетом не использует float.
+
+    Отклонение отсчета от первого отсчета по модулю должно быть меньше 32768 (квадрат - малое целое),
+    для TMP11X это выполняется всегда: весь диапазон -55..150 °C занимает 26240 LSB. Блок объединяется
+    с накопленной статистикой, когда сумма квадратов отклонений достигает 2**30 - 1: при разбросе
+    отсчетов 128 LSB (1 °C) не чаще одного раза на 65536 отсчетов."""
+
+    def __init__(self, scale: float = 7.8125E-3, bins: int = 1024, bin_width: int = 1):
+        """scale - цена младшего разряда: result() возвращает статистику в единицах raw * scale
+        (например °C для TMP11X при scale=TMP11X.RESOLUTION), result_raw() - в raw-единицах;
+        bins, bin_width - гистограмма медианы, как в StreamStats (bin_width в raw-единицах)."""
+        if bins < 2 or bin_width < 1:
+            raise ValueError(f"Неверные параметры гистограммы: bins={bins}, bin_width={bin_width}")
+        self.scale = scale
+        self._bin_width = bin_width
+        self._hist = zero_array("I", bins)
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает накопленную статистику"""
+        self.count = 0
+        self.min = self.max = None
+        # первый отсчет; количество отсчетов блока и суммы их отклонений от первого отсчета
+        self._origin = 0
+        self._block = 0
+        self._sum = 0
+        self._sum_sq = 0
+        # отсчеты предыдущих блоков: количество, среднее отклонение и сумма квадратов отклонений от среднего
+        self._n_acc = 0
+        self._mean_acc = 0.0
+        self._m2_acc = 0.0
+        self.clipped = 0
+        hist = self._hist
+        for i in range(len(hist)):
+            hist[i] = 0
+
+    def add_raw(self, raw: int):
+        """Добавляет raw-отсчет. Постоянное время и память, только целочисленные операции."""
+        if 0 == self.count:
+            self._origin = raw
+            self.min = self.max = raw
+        else:
+            if raw < self.min:
+                self.min = raw
+            if raw > self.max:
+                self.max = raw
+        self.count += 1
+        d = raw - self._origin
+        dd = d * d
+        if self._sum_sq > _SUM_SQ_LIMIT - dd:
+            self._fold()
+        self._block += 1
+        self._sum += d
+        self._sum_sq += dd
+        hist = self._hist
+        nbins = len(hist)
+        k = d // self._bin_width + nbins // 2
+        if k < 0:
+            k = 0
+            self.clipped += 1
+        elif k >= nbins:
+            k = nbins - 1
+            self.clipped += 1
+        hist[k] += 1
+
+    def _combined(self) -> tuple:
+        """Количество, среднее отклонение от первого отсчета и сумма квадратов отклонений от среднего
+        для всех отсчетов: накопленных блоков и текущего блока (формула Чана)"""
+        n_a = self._n_acc
+        n_b = self._block
+        if 0 == n_b:
+            return n_a, self._mean_acc, self._m2_acc
+        s = float(self._sum)
+        mean_b = s / n_b
+        m2_b = self._sum_sq - s * mean_b
+        if 0 == n_a:
+            return n_b, mean_b, m2_b
+        n = n_a + n_b
+        delta = mean_b - self._mean_acc
+        return n, self._mean_acc + delta * n_b / n, self._m2_acc + m2_b + delta * delta * n_a * n_b / n
+
+    def _fold(self):
+        """Объединяет текущий блок с накопленной статистикой и начинает новый блок"""
+        self._n_acc, self._mean_acc, self._m2_acc = self._combined()
+        self._block = self._sum = self._sum_sq = 0
+
+    def _bin_value(self, k: int) -> float:
+        w = self._bin_width
+        return self._origin + (k - len(self._hist) // 2) * w + (w - 1) / 2
+
+    def result_raw(self) -> stats_result | None:
+        """Возвращает статистику в raw-единицах или None, если отсчетов нет"""
+        n = self.count
+        if 0 == n:
+            return None
+        _, mean, m2 = self._combined()
+        avg = self._origin + mean
+        var = m2 / (n - 1) if n > 1 else 0.0
+        lo, hi = _hist_median(self._hist, n)
+        median = (self._bin_value(lo) + self._bin_value(hi)) / 2
+        return stats_result(count=n, min=self.min, max=self.max, avg=avg, median=median,
+                            range=self.max - self.min, std_dev=var ** 0.5)
+
+    def result(self) -> stats_result | None:
+        """Возвращает статистику в единицах raw * scale или None, если отсчетов нет"""
+        r = self.result_raw()
+        if r is None:
+            return None
+        k = self.scale
+        return stats_result(count=r.count, min=k * r.min, max=k * r.max, avg=k * r.avg, median=k * r.median,
+                            range=k * r.range, std_dev=k * r.std_dev)
@@ -0,0 +1,28 @@
+# MIT license
+"""Тесты драйвера на компьютере (CPython) с программной моделью датчика tmp11Xsim"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import tmp11Xhost
+from tmp11Xsim import SimI2C, TMP11XSim
+
+
+@pytest.fixture
+def sim():
+    """Модель датчика TMP117 (0x48, 25 °C)"""
+    return TMP11XSim(address=0x48, temperature=25.0)
+
+
+@pytest.fixture
+def bus(sim):
+    """Шина с моделью датчика sim; time.sleep_*/ticks_* драйвера идут по времени шины"""
+    sim_bus = SimI2C()
+    sim_bus.add_device(sim)
+    tmp11Xhost.use_clock(sim_bus)
+    yield sim_bus
+    tmp11Xhost.use_clock(None)
+    tmp11Xhost._scheduled.clear()
@@ -0,0 +1,74 @@
+# MIT license
+"""Адаптивное управление режимом датчика (tmp11Xadaptive) на программной модели датчика"""
+
+import random
+import time
+import pytest
+from sensor_pack_2.bus_service import I2cAdapter
+from tmp11Xtimod import TMP11X
+from tmp11Xadaptive import AdaptiveController
+
+
+def _noisy(sim, func, seed: int = 1):
+    """Температура func(t) с шумом преобразования: 12 m°C без усреднения, 1.5 m°C с усреднением"""
+    rnd = random.Random(seed)
+
+    def temperature(t: float) -> float:
+        return func(t) + rnd.gauss(0.0, 0.012 if 0 == sim.avg else 0.0015)
+
+    return temperature
+
+
+def _run(bus, sensor: TMP11X, ctl: AdaptiveController, seconds: int):
+    end = bus.now_us() + 1_000_000 * seconds
+    while bus.now_us() < end:
+        time.sleep_ms(sensor.get_conversion_cycle_time())
+        ctl.feed(sensor.get_measurement_value(), time.ticks_ms())
+
+
+def _start(bus) -> tuple:
+    sensor = TMP11X(I2cAdapter(bus))
+    ctl = AdaptiveController(sensor)
+    sensor.start_measurement(conv_cycle_time=ctl.slow[0], average_mode=ctl.slow[1])
+    return sensor, ctl
+
+
+def test_plateau_stays_slow(bus, sim):
+    sensor, ctl = _start(bus)
+    sim.temperature = _noisy(sim, lambda t: 25.0)
+    _run(bus, sensor, ctl, 60)
+    assert AdaptiveController.SLOW == ctl.mode
+    assert 0 == ctl.switches
+
+
+def test_ramp_switches_to_fast_and_back(bus, sim):
+    sensor, ctl = _start(bus)
+    sim.temperature = _noisy(sim, lambda t: 25.0 + 0.5 * t)
+    _run(bus, sensor, ctl, 20)
+    assert AdaptiveController.FAST == ctl.mode
+    assert 0 == sensor.conversion_cycle_time
+    t_stop = bus.now_us() / 1_000_000
+    sim.temperature = _noisy(sim, lambda t: 25.0 + 0.5 * min(t, t_stop))
+    _run(bus, sensor, ctl, 60)
+    assert AdaptiveController.SLOW == ctl.mode
+    assert 2 == ctl.switches
+
+
+def test_rate_between_thresholds_does_not_flip(bus, sim):
+    sensor, ctl = _start(bus)
+    sim.temperature = _noisy(sim, lambda t: 25.0 + 0.03 * t)
+    _run(bus, sensor, ctl, 60)
+    assert AdaptiveController.SLOW == ctl.mode
+    assert 0 == ctl.switches
+    ctl.set_mode(AdaptiveController.FAST)
+    _run(bus, sensor, ctl, 60)
+    assert AdaptiveController.FAST == ctl.mode
+    assert 1 == ctl.switches
+
+
+def test_bad_settings_fail_at_construction(bus):
+    sensor = TMP11X(I2cAdapter(bus))
+    with pytest.raises(ValueError):
+        AdaptiveController(sensor, fast=(8, 0))
+    with pytest.raises(ValueError):
+        AdaptiveController(sensor, slow=(4, 4))
@@ -0,0 +1,58 @@
+# MIT license
+"""Трассировка обращений к шине (sensor_pack_2.bus_trace) на программной модели датчика"""
+
+import pytest
+from sensor_pack_2.bus_trace import BusTracer, TracingI2cAdapter, NO_REG, HIST_BINS, _hist_bin
+from tmp11Xtimod import TMP11X
+
+
+def test_hist_bin():
+    assert [0, 1, 2, 2, 3, 3, 4] == [_hist_bin(d) for d in (0, 1, 2, 3, 4, 7, 8)]
+    assert HIST_BINS - 1 == _hist_bin(1 << 30)
+
+
+def test_ring_keeps_newest():
+    tracer = BusTracer(capacity=4)
+    for i in range(6):
+        tracer.record(100 * i, 0x48, i, bool(i & 1), 2, i)
+    assert 6 == tracer.count and 4 == len(tracer)
+    assert [2, 3, 4, 5] == [r.reg for r in tracer.records()]
+    assert [False, True, False, True] == [r.write for r in tracer.records()]
+    tracer.enabled = False
+    tracer.record(0, 0x48, 0, False, 2, 1)
+    assert 6 == tracer.count
+    tracer.clear()
+    assert 0 == len(tracer) and [] == list(tracer.register_stats())
+    with pytest.raises(ValueError):
+        BusTracer(capacity=0)
+
+
+def test_driver_register_stats(bus, sim):
+    tracer = BusTracer(capacity=8)
+    sensor = TMP11X(TracingI2cAdapter(bus, tracer))
+    tracer.clear()
+    for _ in range(3):
+        sensor.get_measurement_raw()
+    sensor.get_config()
+    sensor.set_thresholds_raw((0, 3200))
+    stats = {(s.address, s.reg): s for s in tracer.register_stats()}
+    assert {(0x48, 0), (0x48, 1), (0x48, 2), (0x48, 3)} == set(stats)
+    temp = stats[(0x48, 0)]
+    assert 3 == temp.reads and 0 == temp.writes and 6 == temp.bytes
+    assert temp.total_us > 0 and 3 == sum(temp.hist)
+    assert 1 == stats[(0x48, 2)].writes and 1 == stats[(0x48, 3)].writes
+
+
+def test_errors_recorded_and_raised(bus, sim):
+    tracer = BusTracer()
+    adapter = TracingI2cAdapter(bus, tracer)
+    with pytest.raises(OSError):
+        adapter.read_buf_from_memory(0x49, 0, bytearray(2))
+    with pytest.raises(OSError):
+        adapter.read(0x49, 2)
+    rec = list(tracer.records())
+    assert [True, True] == [r.error for r in rec]
+    assert [0, NO_REG] == [r.reg for r in rec]
+    stats = list(tracer.register_stats())
+    assert [0, NO_REG] == [s.reg for s in stats]
+    assert [1, 1] == [s.errors for s in stats]
@@ -0,0 +1,36 @@
+# MIT license
+"""Пакетное преобразование сырых значений (tmp11Xconv)"""
+
+from array import array
+from tmp11Xconv import raw_to_millicelsius_into, raw_to_celsius_into
+from tmp11Xtimod import raw_to_millicelsius
+
+_EDGES = (-32768, -32767, -5120, -1, 0, 1, 2560, 16000, 32766, 32767)
+
+
+def test_millicelsius_matches_scalar():
+    src = array("h", _EDGES)
+    dst = array("i", bytes(4 * len(src)))
+    assert len(src) == raw_to_millicelsius_into(src, dst)
+    assert [raw_to_millicelsius(v) for v in _EDGES] == list(dst)
+    assert -256000 == dst[0] and 255992 == dst[-1]
+    assert 20000 == dst[6]
+
+
+def test_celsius_edges():
+    src = array("h", (-32768, 32767, 0, -1))
+    dst = array("f", bytes(4 * len(src)))
+    assert 4 == raw_to_celsius_into(src, dst)
+    assert [-256.0, 255.9921875, 0.0, -0.0078125] == list(dst)
+
+
+def test_count_limits():
+    src = array("h", range(8))
+    dst = array("i", bytes(4 * 4))
+    # не больше длины приемника, n ограничивает количество
+    assert 4 == raw_to_millicelsius_into(src, dst)
+    dst = array("i", bytes(4 * 8))
+    assert 3 == raw_to_millicelsius_into(memoryview(src)[5:], dst)
+    assert [39, 47, 55] == list(dst[:3])
+    assert 2 == raw_to_celsius_into(src, array("f", bytes(4 * 8)), 2)
+    assert 0 == raw_to_millicelsius_into(src, dst, 0)
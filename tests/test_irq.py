@@ -0,0 +1,77 @@
+# MIT license
+"""Обработка сигнала ALERT по прерыванию (tmp11Xirq, tmp11Xalert) на программной модели датчика"""
+
+import time
+from array import array
+from machine import Pin
+import tmp11Xhost
+from sensor_pack_2.bus_service import I2cAdapter
+from tmp11Xtimod import TMP11X
+from tmp11Xirq import DataReadyReader
+from tmp11Xalert import AlertEngine
+
+
+class SimPin(Pin):
+    """Вывод MCU, подключенный к выводу ALERT модели датчика"""
+
+    def __init__(self, sim):
+        super().__init__()
+        self._sim = sim
+        sim.alert_callback = self._edge
+
+    def value(self, level=None):
+        return int(self._sim.alert_pin)
+
+    def _edge(self, sim):
+        if self.handler is not None:
+            self.handler(self)
+
+
+def test_data_ready_reader(bus, sim):
+    reader = DataReadyReader(TMP11X(I2cAdapter(bus)), SimPin(sim), capacity=16)
+    reader.start(conv_cycle_time=0, average_mode=0)
+    raw = array("h", 16 * [0])
+    for _ in range(5):
+        time.sleep_ms(16)
+    assert 5 == reader.read_into(raw)
+    assert 25 * 128 == raw[0]
+    assert 0 == reader.missed
+
+
+def test_missed_schedule_is_drained(bus, sim, monkeypatch):
+    reader = DataReadyReader(TMP11X(I2cAdapter(bus)), SimPin(sim), capacity=16)
+    reader.start(conv_cycle_time=0, average_mode=0)
+    raw = array("h", 16 * [0])
+    # очередь micropython.schedule заполнена: прерывание не может запланировать чтение
+    monkeypatch.setattr(tmp11Xhost, "SCHEDULER_DEPTH", 0)
+    bus.sleep_ms(16)
+    assert 1 == reader.missed
+    # ALERT остается активным, новых фронтов нет
+    for _ in range(3):
+        bus.sleep_ms(16)
+    assert 1 == reader.missed
+    monkeypatch.setattr(tmp11Xhost, "SCHEDULER_DEPTH", 4)
+    # чтение пропущенного отсчета снимает Data_Ready, и прерывания возобновляются
+    assert 1 == reader.read_into(raw)
+    for _ in range(2):
+        time.sleep_ms(16)
+    assert 2 == reader.read_into(raw)
+
+
+def test_alert_engine(bus, sim):
+    highs = []
+    sensor = TMP11X(I2cAdapter(bus))
+    sensor.start_measurement(conv_cycle_time=0, average_mode=0)
+    engine = AlertEngine(sensor, SimPin(sim), on_high=highs.append)
+    engine.start(thresholds=(20.0, 30.0))
+    time.sleep_ms(16)
+    assert 0 == engine.available()
+    sim.temperature = 35.0
+    time.sleep_ms(16)
+    assert 1 == len(highs)
+    ticks = array("I", 4 * [0])
+    kinds = bytearray(4)
+    assert 1 == engine.read_events(ticks, kinds)
+    assert AlertEngine.HIGH == kinds[0]
+    assert highs[0] == ticks[0]
+    assert 0 == engine.missed
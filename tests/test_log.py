@@ -0,0 +1,58 @@
+# MIT license
+"""Двоичный журнал tmp11Xlog: запись на MCU и чтение на компьютере (tmp11Xloghost)"""
+
+import io
+import pytest
+from tmp11Xlog import LogWriter, LogReader, HEADER_SIZE
+from tmp11Xloghost import LogFile, NO_DATA
+
+# плавный ход, разности на 1, 2 и 3 байта varint, крайние значения int16 и "нет данных"
+_SAMPLES = ([2560 + i % 7 for i in range(50)] + [2560 + 100, 2560 - 9000, 32767, -32768, 0, -1, 1]
+            + [NO_DATA, NO_DATA] + [3000 - 3 * i for i in range(40)])
+
+
+def _write(stream, block_size: int = 32) -> LogWriter:
+    log = LogWriter(stream, uid=(0x1234, 5, 6), config=0x0220, start_ticks=-1, period_ms=16,
+                    block_size=block_size)
+    for v in _SAMPLES:
+        log.append(v)
+    log.close()
+    return log
+
+
+def test_reader_round_trip():
+    stream = io.BytesIO()
+    log = _write(stream)
+    assert len(_SAMPLES) == log.count
+    assert HEADER_SIZE + 32 * log.blocks == len(stream.getvalue())
+    stream.seek(0)
+    reader = LogReader(stream)
+    assert (0x1234, 5, 6) == reader.uid
+    assert 0x0220 == reader.config and 0xFFFF_FFFF == reader.start_ticks and 16 == reader.period_ms
+    assert log.blocks == reader.blocks > 1
+    assert _SAMPLES == list(reader)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_log_file_round_trip(tmp_path, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    path = tmp_path / "t.log"
+    with open(path, "wb") as f:
+        log = _write(f)
+    with LogFile(str(path), use_numpy=use_numpy) as lf:
+        assert log.blocks == lf.blocks
+        assert _SAMPLES == list(lf)
+        # порции по 2 блока: номера первых отсчетов совпадают с номерами в журнале
+        index = 0
+        for first, raw in lf.chunks(blocks_per_chunk=2):
+            assert index == first
+            assert _SAMPLES[first:first + len(raw)] == list(raw.tolist())
+            index += len(raw)
+        assert len(_SAMPLES) == index
+        first, raw = lf.block(-1)
+        assert _SAMPLES[first:] == list(raw.tolist())
+        values = [v for v in _SAMPLES if NO_DATA != v]
+        st = lf.stats()
+        assert len(values) == st.result().count
+        assert 32767 * 7.8125E-3 == st.result().max
@@ -0,0 +1,52 @@
+# MIT license
+"""Группа датчиков на одной шине (tmp11Xmulti) на программных моделях датчиков"""
+
+import time
+import pytest
+import tmp11Xhost
+from sensor_pack_2.bus_service import I2cAdapter
+from tmp11Xsim import SimI2C, TMP11XSim
+from tmp11Xmulti import TMP11XArray
+
+ADDRESSES = (0x48, 0x49, 0x4A, 0x4B)
+# время транзакции записи регистра на 400 кГц с запасом, мкс
+WRITE_US = 150
+
+
+@pytest.fixture
+def sims():
+    """Четыре модели датчика на одной шине: 25, 26, 27, 28 °C"""
+    bus = SimI2C()
+    devices = [bus.add_device(TMP11XSim(address=addr, temperature=25.0 + i)) for i, addr in enumerate(ADDRESSES)]
+    tmp11Xhost.use_clock(bus)
+    yield bus, devices
+    tmp11Xhost.use_clock(None)
+
+
+def test_start_trigger_read(sims):
+    bus, devices = sims
+    group = TMP11XArray(I2cAdapter(bus), ADDRESSES)
+    # 4 датчика подряд: разброс не больше времени трех транзакций
+    assert 0 < group.start(single_shot=True, conv_cycle_time=0, average_mode=0) < 3 * WRITE_US
+    time.sleep_ms(group.get_conversion_cycle_time())
+    group.read_all()
+    assert [25.0, 26.0, 27.0, 28.0] == [group.get_celsius(i) for i in range(len(group))]
+    assert 0 < group.read_skew_us < 3 * WRITE_US
+    for i, sim in enumerate(devices):
+        sim.temperature = 30.0 + i
+    assert 0 < group.trigger() < 3 * WRITE_US
+    time.sleep_ms(group.get_conversion_cycle_time())
+    group.read_all()
+    assert [30.0, 31.0, 32.0, 33.0] == [group.get_celsius(i) for i in range(len(group))]
+
+
+def test_bad_settings_leave_group_untouched(sims):
+    bus, devices = sims
+    group = TMP11XArray(I2cAdapter(bus), ADDRESSES)
+    words = [s.get_config_word() for s in group.sensors]
+    transactions = bus.transactions
+    for kwargs in ({"conv_cycle_time": 8}, {"average_mode": 4}):
+        with pytest.raises(ValueError):
+            group.start(**kwargs)
+    assert transactions == bus.transactions
+    assert words == [s.get_config_word() for s in group.sensors]
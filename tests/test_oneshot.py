@@ -0,0 +1,28 @@
+# MIT license
+"""Однократные измерения OneShotScheduler (tmp11Xoneshot) на программной модели датчика"""
+
+import tmp11Xsim
+from sensor_pack_2.bus_service import I2cAdapter
+from tmp11Xtimod import TMP11X
+from tmp11Xoneshot import OneShotScheduler
+
+
+def test_sample_waits_with_margin(bus, sim, monkeypatch):
+    # генератор датчика на 5 % медленнее номинала: преобразование длится дольше conversion_time_ms
+    slow = tuple(21 * t // 20 for t in tmp11Xsim.AVG_ACTIVE_TIME_US)
+    monkeypatch.setattr(tmp11Xsim, "AVG_ACTIVE_TIME_US", slow)
+    sched = OneShotScheduler(TMP11X(I2cAdapter(bus)), average=0, period_ms=100)
+    assert sched.wait_ms > sched.conversion_time_ms
+    assert 25 * 128 == sched.sample()
+
+
+def test_scheduler_keeps_sensor_fields(bus, sim):
+    sensor = TMP11X(I2cAdapter(bus))
+    before = sensor.get_config_word()
+    sched = OneShotScheduler(sensor, average=2, period_ms=1000)
+    # поля драйвера не изменяются: они по-прежнему совпадают с конфигурацией датчика
+    assert before == sensor.get_config_word()
+    assert 2 == sensor.conversion_mode and 1 == sensor.average
+    sched.trigger()
+    assert 3 == sim.mode and 2 == sim.avg and sensor.conversion_cycle_time == sim.conv
+    assert sched.trigger_word == sim.regs[1] & 0x0FFC
@@ -0,0 +1,51 @@
+# MIT license
+"""Поток отсчетов SamplePipeline (tmp11Xpipeline) на программной модели датчика"""
+
+import time
+from sensor_pack_2.bus_service import I2cAdapter
+from tmp11Xtimod import TMP11X
+from tmp11Xpipeline import SamplePipeline
+
+
+def _pipeline(bus, capacity: int = 64) -> SamplePipeline:
+    sensor = TMP11X(I2cAdapter(bus))
+    sensor.start_measurement(conv_cycle_time=0, average_mode=0)
+    return SamplePipeline(sensor, capacity=capacity)
+
+
+def test_every_conversion_once(bus, sim):
+    pipe = _pipeline(bus)
+    seen = []
+    pipe.run(20, lambda raw, ticks, seq: seen.append((raw, seq)))
+    assert [(25 * 128, seq) for seq in range(20)] == seen
+    assert 0 == pipe.missed
+    assert 20 == len(pipe.ring)
+
+
+def test_long_stall_fills_ring_only(bus, sim):
+    pipe = _pipeline(bus, capacity=8)
+    pipe.run(2)
+    period_ms = sim.cycle_time_us() // 1000
+    # остановка на 30 периодов: пропусков больше, чем помещается в ring
+    time.sleep_ms(30 * period_ms)
+    seen = []
+    pipe.run(1, lambda raw, ticks, seq: seen.append((raw, seq)))
+    missed = pipe.missed
+    assert 29 <= missed <= 31
+    assert pipe.seq == 2 + missed + 1
+    # обратный вызов только для отсчетов, оставшихся в ring
+    assert 8 == len(seen)
+    assert [pipe.seq - 8 + i for i in range(8)] == [seq for _, seq in seen]
+    assert [-32768] * 7 + [25 * 128] == [raw for raw, _ in seen]
+    assert 8 == len(pipe.ring)
+
+
+def test_period_estimate_bounded(bus, sim):
+    pipe = _pipeline(bus)
+    nominal = pipe.nominal_us
+    # генератор датчика на 30 % медленнее номинала: уточненный период не выходит за +10 %
+    slow = 13 * sim.cycle_time_us() // 10
+    sim.cycle_time_us = lambda: slow
+    pipe.run(200)
+    assert nominal < pipe.period_us <= nominal + nominal // 10
+    assert 0 == pipe.missed
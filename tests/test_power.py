@@ -0,0 +1,100 @@
+# MIT license
+"""Регистратор LowPowerLogger (tmp11Xpower): холодный и теплый старт, состояние в памяти RTC"""
+
+import gc
+import machine
+import pytest
+from sensor_pack_2.bus_service import I2cAdapter
+from tmp11Xpower import LowPowerLogger
+
+
+class FakeRTC:
+    """Память RTC, сохраняющаяся между "перезапусками" программы"""
+
+    def __init__(self):
+        self.data = b""
+        self.writes = 0
+
+    def memory(self, data=None):
+        if data is None:
+            return self.data
+        self.data = bytes(data)
+        self.writes += 1
+
+
+class Reset(Exception):
+    """Выход из machine.deepsleep: программа начинается заново"""
+
+
+@pytest.fixture
+def sleeps(bus, monkeypatch):
+    """Заменители machine.lightsleep/deepsleep по времени модели. Возвращает список ("light"|"deep", мс)"""
+    calls = []
+
+    def lightsleep(ms):
+        calls.append(("light", ms))
+        bus.sleep_ms(ms)
+
+    def deepsleep(ms):
+        calls.append(("deep", ms))
+        bus.sleep_ms(ms)
+        raise Reset
+
+    monkeypatch.setattr(machine, "lightsleep", lightsleep)
+    monkeypatch.setattr(machine, "deepsleep", deepsleep)
+    return calls
+
+
+def _wake(bus, rtc, batches, **kwargs) -> LowPowerLogger:
+    """Одно пробуждение после глубокого сна: создание регистратора и run(deep=True) до deepsleep"""
+    logger = LowPowerLogger(I2cAdapter(bus), average=0, period_ms=1000, batch=4, rtc=rtc,
+                            on_batch=lambda raw, first: batches.append((list(raw), first)), **kwargs)
+    with pytest.raises(Reset):
+        logger.run(deep=True)
+    return logger
+
+
+def test_cold_then_warm_starts(bus, sim, sleeps):
+    rtc = FakeRTC()
+    batches = []
+    logger = _wake(bus, rtc, batches)
+    assert not logger.warm
+    assert 1 == logger.index
+    for i in range(1, 10):
+        sim.temperature = 20.0 + i
+        # TMP11X.__del__ записывает конфигурацию (Shutdown): экземпляр прошлого пробуждения удаляется заранее
+        del logger
+        gc.collect()
+        bus.reset_counters()
+        logger = _wake(bus, rtc, batches)
+        assert logger.warm
+        # теплый старт без записи конфигурации: запуск преобразования и чтение TEMP
+        assert 2 == bus.transactions
+        assert 1 == bus.reg_writes.get(1, 0)
+        assert 1 == bus.reg_reads.get(0, 0)
+        assert i + 1 == logger.index
+    assert [([25 * 128, 21 * 128, 22 * 128, 23 * 128], 0),
+            ([24 * 128, 25 * 128, 26 * 128, 27 * 128], 4)] == batches
+    # два отсчета ждут в памяти RTC
+    logger = LowPowerLogger(I2cAdapter(bus), average=0, period_ms=1000, batch=4, rtc=rtc,
+                            on_batch=lambda raw, first: batches.append((list(raw), first)))
+    assert logger.warm and 10 == logger.index
+    logger.flush()
+    assert ([28 * 128, 29 * 128], 8) == batches[-1]
+
+
+def test_changed_settings_force_cold_start(bus, sim, sleeps):
+    rtc = FakeRTC()
+    _wake(bus, rtc, [])
+    logger = LowPowerLogger(I2cAdapter(bus), average=1, period_ms=1000, rtc=rtc)
+    assert not logger.warm
+    assert 0 == logger.index
+
+
+def test_deep_sleep_only(bus, sim, sleeps, monkeypatch):
+    # порт, на котором deepsleep возвращает управление: после него не должно быть lightsleep
+    monkeypatch.setattr(machine, "deepsleep", lambda ms: sleeps.append(("deep", ms)))
+    logger = LowPowerLogger(I2cAdapter(bus), average=0, period_ms=1000, rtc=FakeRTC())
+    logger.run(deep=True, count=2)
+    wait = logger._sched.wait_ms
+    assert [("light", wait), ("deep", 1000 - wait)] * 2 == sleeps
@@ -0,0 +1,25 @@
+# MIT license
+"""Кольцевой буфер отсчетов (sensor_pack_2.ring_buffer)"""
+
+import pytest
+from sensor_pack_2.ring_buffer import SampleRing, zero_array
+
+
+def test_zero_array():
+    a = zero_array("I", 1000)
+    assert "I" == a.typecode
+    assert 1000 == len(a)
+    assert not any(a)
+
+
+def test_ring_overwrite():
+    ring = SampleRing(3, timestamps=True, scale=0.5)
+    for k in range(5):
+        ring.append(k, 10 * k)
+    assert 3 == len(ring)
+    assert 2 == ring.dropped
+    assert [2, 3, 4] == list(ring.raw_values())
+    assert 2.0 == ring.get(-1)
+    assert 40 == ring.get_ticks(-1)
+    with pytest.raises(IndexError):
+        ring.get_raw(3)
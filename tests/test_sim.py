@@ -0,0 +1,181 @@
+# MIT license
+"""Драйвер TMP11X на программной модели датчика (tmp11Xsim)"""
+
+import time
+import pytest
+from sensor_pack_2.bus_service import I2cAdapter
+from tmp11Xtimod import TMP11X
+
+
+def test_ticks_wrap():
+    assert 0 == time.ticks_add(time.ticks_add(0, -1), 1)
+    assert -1 == time.ticks_diff(time.ticks_add(0, -1), 0)
+    assert 5 == time.ticks_diff(2, time.ticks_add(0, -3))
+
+
+def test_measurement(bus, sim):
+    sensor = TMP11X(I2cAdapter(bus))
+    time.sleep_ms(sensor.get_conversion_cycle_time())
+    assert sensor.get_data_status()
+    assert abs(sensor.get_measurement_value() - 25.0) < 0.01
+    sim.temperature = -10.0
+    time.sleep_ms(sensor.get_conversion_cycle_time())
+    assert abs(sensor.get_measurement_value() + 10.0) < 0.01
+
+
+def test_id_and_config_round_trip(bus):
+    sensor = TMP11X(I2cAdapter(bus))
+    assert 0x117 == sensor.get_id().device_id
+    sensor.average = 0
+    sensor.conversion_cycle_time = 2
+    sensor.set_config()
+    word = sensor.get_config()
+    assert 0 == (word >> 5) & 0x03
+    assert 2 == (word >> 7) & 0x07
+
+
+def test_thresholds(bus):
+    sensor = TMP11X(I2cAdapter(bus))
+    assert (-10.0, 30.0) == sensor.set_thresholds((-10.0, 30.0))
+    with pytest.raises(ValueError):
+        sensor.set_thresholds((30.0, -10.0))
+
+
+def test_thresholds_raw(bus):
+    sensor = TMP11X(I2cAdapter(bus))
+    assert (0, 39) == sensor.set_thresholds_raw((0, 39))
+    assert (100, 200) == sensor.set_thresholds_raw((100, 200), read_back=False)
+    with pytest.raises(ValueError):
+        sensor.set_thresholds_raw((0, 38))
+    with pytest.raises(ValueError):
+        sensor.set_thresholds_raw((-30000, 30000))
+
+
+def test_program_eeprom_validates_before_unlock(bus, sim):
+    sensor = TMP11X(I2cAdapter(bus))
+    time.sleep_ms(5)
+    for kwargs in ({"thresholds": (-30000, 30000)}, {"thresholds": (100, 120)},
+                   {"config": 0x2220}, {"offset": 0x8000}):
+        with pytest.raises(ValueError):
+            sensor.program_eeprom(**kwargs)
+    assert 0 == sim.eeprom_writes
+    assert 2 == sensor.program_eeprom(thresholds=(-1280, 3840))
+    assert 2 == sim.eeprom_writes
+    assert 0 == sensor.program_eeprom(thresholds=(-1280, 3840))
+    assert (-1280, 3840) == sensor.set_thresholds_raw()
+
+
+def test_async_program_eeprom_validates_before_unlock(bus, sim):
+    import asyncio
+    from tmp11Xasync import AsyncTMP11X
+    sensor = AsyncTMP11X(TMP11X(I2cAdapter(bus)))
+    time.sleep_ms(5)
+    with pytest.raises(ValueError):
+        asyncio.run(sensor.program_eeprom(thresholds=(-30000, 30000)))
+    assert 0 == sim.eeprom_writes
+    assert 1 == asyncio.run(sensor.program_eeprom(offset=16))
+    assert 1 == sim.eeprom_writes
+
+
+def test_read_registers(bus):
+    sensor = TMP11X(I2cAdapter(bus))
+    sensor.set_thresholds_raw((-1280, 3840))
+    transactions = bus.transactions
+    snap = sensor.get_snapshot()
+    # по одной транзакции на регистр
+    assert 10 == bus.transactions - transactions
+    assert (3840, -1280, 0x0117) == (snap.t_high, snap.t_low, snap.device_id)
+
+
+def test_sync_and_async_eeprom_sequences_match(bus, sim):
+    import asyncio
+    from sensor_pack_2.bus_trace import BusTracer, TracingI2cAdapter
+    from tmp11Xasync import AsyncTMP11X
+    tracer = BusTracer(capacity=64)
+    sensor = TMP11X(TracingI2cAdapter(bus, tracer))
+    time.sleep_ms(5)
+    traces = []
+    for run in (lambda: sensor.program_eeprom(thresholds=(-1280, 3840)),
+                lambda: asyncio.run(AsyncTMP11X(sensor).program_eeprom(thresholds=(-1281, 3841)))):
+        tracer.clear()
+        assert 2 == run()
+        traces.append([(r.reg, r.write) for r in tracer.records()])
+    assert traces[0] == traces[1]
+    # EEPROM снова заблокирована
+    assert (0x04, True) == traces[1][-2]
+
+
+def test_program_eeprom_reload_reverts_live_registers(bus):
+    sensor = TMP11X(I2cAdapter(bus))
+    time.sleep_ms(5)
+    sensor.set_temperature_offset_raw(64)
+    assert 2 == sensor.program_eeprom(thresholds=(-1280, 3840))
+    # смещение не передано: после сброса оно снова равно значению из EEPROM
+    assert 0 == sensor.get_temperature_offset_raw()
+
+
+def test_test_bit():
+    from tmp11Xtimod import _test_bit
+    assert _test_bit(0x8000, 0x8000)
+    assert _test_bit(0xA000, 0x2000)
+    assert not _test_bit(0x7FFF, 0x8000)
+    assert _test_bit(0x1000, 0x3000)   # хотя бы один бит маски
+    assert not _test_bit(0, 0xFFFF)
+
+
+def test_read_status_updates_flags_in_place(bus, sim):
+    from tmp11Xtimod import TMP11XFlags
+    sensor = TMP11X(I2cAdapter(bus))
+    sensor.set_thresholds((-10.0, 20.0))   # 25 °C > THIGH
+    flags = TMP11XFlags()
+    time.sleep_ms(sensor.get_conversion_cycle_time())
+    bus.reset_counters()
+    raw = sensor.read_status(flags)
+    assert raw == flags.raw
+    assert flags.data_ready and flags.high_alert
+    assert not flags.low_alert and not flags.eeprom_busy
+    # чтение сбросило Data_Ready и защелкнутый HIGH_Alert; тот же объект обновлен повторно
+    same = flags
+    raw = sensor.read_status(flags, bytearray(2))
+    assert same is flags and raw == flags.raw
+    assert not flags.data_ready and not flags.high_alert
+    # по одной транзакции на вызов, только регистр конфигурации
+    assert 2 == bus.transactions and {1: 2} == bus.reg_reads
+
+
+def test_get_set_reg_fast_path(bus, sim):
+    sensor = TMP11X(I2cAdapter(bus))
+    bus.reset_counters()
+    # запись: значение маскируется до 16 бит, старший байт передается первым
+    sensor.get_set_reg(7, None, -2)
+    assert 0xFFFE == sim.regs[7]
+    sensor.get_set_reg(2, None, 0x1234)
+    assert 0x1234 == sim.regs[2]
+    # чтение декодируется из буфера драйвера со знаком или без
+    assert -2 == sensor.get_set_reg(7, "h")
+    assert 0xFFFE == sensor.get_set_reg(7, "H")
+    assert 0x1234 == sensor.get_set_reg(2, "h")
+    assert 5 == bus.transactions
+    with pytest.raises(ValueError):
+        sensor.get_set_reg(7, None)
+    assert 5 == bus.transactions
+
+
+def test_adopt_reads_config_once(bus, sim):
+    # конфигурация, установленная до перезапуска MCU: One-shot, CONV=4, AVG=0; преобразование завершено
+    sim.write_reg(1, 0x0E00, bus.now_us())
+    time.sleep_ms(16)
+    bus.reset_counters()
+    sensor = TMP11X(I2cAdapter(bus), adopt=True)
+    # одно чтение конфигурации, без записи: преобразования датчика не прерываются
+    assert 1 == bus.transactions
+    assert {1: 1} == bus.reg_reads and {} == bus.reg_writes
+    assert 3 == sensor.conversion_mode and 4 == sensor.conversion_cycle_time and 0 == sensor.average
+    assert sensor.data_ready
+
+
+def test_config_and_adopt_are_exclusive(bus):
+    bus.reset_counters()
+    with pytest.raises(ValueError):
+        TMP11X(I2cAdapter(bus), config=0x0220, adopt=True)
+    assert 0 == bus.transactions
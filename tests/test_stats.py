@@ -0,0 +1,38 @@
+# MIT license
+"""Потоковая статистика (sensor_pack_2.stats)"""
+
+import random
+import statistics
+from sensor_pack_2 import stats
+from sensor_pack_2.stats import RawStreamStats
+
+
+def _check(st: RawStreamStats, values: list):
+    r = st.result_raw()
+    assert len(values) == r.count
+    assert min(values) == r.min and max(values) == r.max
+    assert abs(statistics.fmean(values) - r.avg) < 1E-6
+    assert abs(statistics.stdev(values) - r.std_dev) < 1E-6
+
+
+def test_raw_stats():
+    rnd = random.Random(1)
+    values = [3200 + rnd.randint(-64, 64) for _ in range(1000)]
+    st = RawStreamStats()
+    for v in values:
+        st.add_raw(v)
+    _check(st, values)
+    assert 3200 * 7.8125E-3 - 0.01 < st.result().avg < 3200 * 7.8125E-3 + 0.01
+
+
+def test_raw_stats_accumulators_stay_small(monkeypatch):
+    # малый предел: блоки объединяются часто
+    monkeypatch.setattr(stats, "_SUM_SQ_LIMIT", 50_000)
+    rnd = random.Random(2)
+    values = [rnd.randint(-7040, 19200) if k % 100 == 0 else rnd.randint(3000, 3400) for k in range(5000)]
+    st = RawStreamStats()
+    for v in values:
+        st.add_raw(v)
+        assert abs(st._sum) <= st._sum_sq <= max(50_000, (v - values[0]) ** 2)
+    assert st._n_acc > 0
+    _check(st, values)
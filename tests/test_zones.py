@@ -0,0 +1,80 @@
+# MIT license
+"""Банк температурных зон (tmp11Xzones) на программной модели датчика"""
+
+import time
+from sensor_pack_2.bus_trace import BusTracer, TracingI2cAdapter
+from tmp11Xtimod import TMP11X
+from tmp11Xzones import ThresholdBank
+
+# 25, 30, 35, 40 °C, гистерезис 0.5 °C
+BOUNDS = [celsius * 128 for celsius in (25, 30, 35, 40)]
+THIGH = 0x02
+TLOW = 0x03
+
+
+def _bank(bus):
+    tracer = BusTracer(capacity=16)
+    sensor = TMP11X(TracingI2cAdapter(bus, tracer))
+    changes = []
+    bank = ThresholdBank(sensor, BOUNDS, hysteresis=64, on_change=lambda old, new, raw: changes.append(new))
+    tracer.clear()
+    return sensor, tracer, bank, changes
+
+
+def _writes(tracer: BusTracer) -> list:
+    regs = [r.reg for r in tracer.records() if r.write]
+    tracer.clear()
+    return regs
+
+
+def test_window_matches_comparator():
+    bank = ThresholdBank(None, BOUNDS, hysteresis=64)
+    assert (BOUNDS[0] - 64, BOUNDS[1] - 1) == bank.window(1)
+    assert (TMP11X.THRESHOLD_RAW_MIN, BOUNDS[0] - 1) == bank.window(0)
+    assert (BOUNDS[3] - 64, TMP11X.THRESHOLD_RAW_MAX) == bank.window(4)
+    # на границе отсчет уже в верхней зоне, а компаратор - выше THIGH
+    assert 1 == bank.classify(BOUNDS[0])
+    assert BOUNDS[0] > bank.window(0)[1]
+
+
+def test_ascent_and_descent_with_hysteresis(bus):
+    sensor, tracer, bank, changes = _bank(bus)
+    assert 0 == bank.update(BOUNDS[0] - 1)
+    assert [THIGH, TLOW] == _writes(tracer)
+    assert 1 == bank.update(BOUNDS[0])
+    assert [THIGH, TLOW] == _writes(tracer)
+    assert bank.window(1) == sensor.set_thresholds_raw()
+    tracer.clear()
+    # внутри гистерезиса зона не меняется, шина не используется
+    assert 1 == bank.update(BOUNDS[0] - 64)
+    assert [] == _writes(tracer)
+    assert 0 == bank.update(BOUNDS[0] - 65)
+    assert [TLOW, THIGH] == _writes(tracer)
+    assert [0, 1, 0] == changes
+
+
+def test_multi_zone_jumps(bus, sim):
+    sensor, tracer, bank, changes = _bank(bus)
+    bank.update(0)
+    _writes(tracer)
+    assert 4 == bank.update(BOUNDS[3] + 10)
+    assert [THIGH, TLOW] == _writes(tracer)
+    assert 1 == bank.update(BOUNDS[1] - 65)
+    assert [TLOW, THIGH] == _writes(tracer)
+    assert 3 == bank.reprograms
+    assert bank.window(1) == sensor.set_thresholds_raw()
+
+
+def test_hardware_alert_at_bound(bus, sim):
+    sensor, tracer, bank, changes = _bank(bus)
+    sensor.start_measurement(conv_cycle_time=0, average_mode=0)
+    sim.temperature = 25.0
+    time.sleep_ms(16)
+    raw = sensor.get_measurement_raw()
+    assert BOUNDS[0] == raw
+    bank.update(raw - 1)
+    sensor.get_flags()
+    time.sleep_ms(16)
+    # отсчет на границе: программа переходит в зону 1, компаратор сообщает о превышении THIGH
+    assert sensor.get_flags().high_alert
+    assert 1 == bank.update(sensor.get_measurement_raw())
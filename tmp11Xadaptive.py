@@ -0,0 +1,120 @@
+# micropython
+# MIT license
+"""Адаптивное управление усреднением и временем цикла преобразования TMP117/TMP119.
+
+Контроллер получает поток измерений и оценивает скорость изменения температуры (°C/с)
+и шум отсчетов (экспоненциальное скользящее среднее). Пока температура меняется, датчик работает
+в быстром режиме (по умолчанию: цикл 16 мс, без усреднения), а когда температура стабильна -
+в медленном (по умолчанию: цикл 1 с, 64 усреднения), который дает меньший шум, меньше трафика на шине
+и меньше энергопотребление. Переключения разделены гистерезисом порогов и ограничены по частоте,
+поэтому регистр конфигурации не перезаписывается при каждом колебании.
+
+Пример:
+    ctl = AdaptiveController(sensor)
+    sensor.start_measurement(conv_cycle_time=ctl.slow[0], average_mode=ctl.slow[1])
+    while True:
+        time.sleep_ms(sensor.get_conversion_cycle_time())
+        val = sensor.get_measurement_value()
+        if val is not None:
+            ctl.feed(val, time.ticks_ms())
+"""
+
+import time
+from sensor_pack_2.base_sensor import check_range
+from tmp11Xtimod import TMP11X, _CONV_RANGE, _AVG_RANGE
+
+
+class AdaptiveController:
+    """Переключение настроек (CONV, AVG) датчика по динамике сигнала"""
+    # режимы
+    SLOW = 0
+    FAST = 1
+
+    def __init__(self, sensor: TMP11X, fast: tuple = (0, 0), slow: tuple = (4, 3),
+                 fast_rate: float = 0.05, slow_rate: float = 0.01, noise_factor: float = 3.0,
+                 min_switch_interval_ms: int = 10_000, tau_ms: int = 2000):
+        """sensor - драйвер датчика в режиме непрерывных измерений;
+        fast, slow - настройки (conversion_cycle_time, average) быстрого и медленного режимов;
+        fast_rate - скорость изменения температуры, °C/с, выше которой включается быстрый режим;
+        slow_rate - скорость, ниже которой включается медленный режим (slow_rate < fast_rate, гистерезис);
+        noise_factor - скорость должна превышать шум (°C/с) в noise_factor раз, чтобы считаться изменением;
+        min_switch_interval_ms - минимальный интервал между перезаписями регистра конфигурации;
+        tau_ms - постоянная времени сглаживания скорости и шума, мс. Не зависит от периода отсчетов,
+        поэтому оценки сопоставимы в быстром и медленном режимах."""
+        if not 0 < slow_rate < fast_rate:
+            raise ValueError(f"Должно быть 0 < slow_rate < fast_rate: {slow_rate}, {fast_rate}")
+        for conv, avg in (fast, slow):
+            check_range(conv, _CONV_RANGE, "conversion_cycle_time")
+            check_range(avg, _AVG_RANGE, "average")
+        self._sensor = sensor
+        self.fast = fast
+        self.slow = slow
+        self.fast_rate = fast_rate
+        self.slow_rate = slow_rate
+        self.noise_factor = noise_factor
+        self.min_switch_interval_ms = min_switch_interval_ms
+        self.tau_ms = tau_ms
+        self.mode = AdaptiveController.SLOW
+        # сглаженные скорость изменения температуры и шум мгновенной скорости, °C/с
+        self.rate = 0.0
+        self.noise = 0.0
+        # стандартная ошибка сглаженной скорости, °C/с
+        self.rate_error = 0.0
+        # количество перезаписей конфигурации
+        self.switches = 0
+        self._prev_value = None
+        self._prev_ticks = 0
+        self._switch_ticks = None
+
+    def feed(self, value: float, ticks_ms: int) -> bool:
+        """Учитывает измерение value (°C), полученное в момент ticks_ms (time.ticks_ms()).
+        Возвращает Истина, если настройки датчика были изменены."""
+        prev = self._prev_value
+        prev_ticks = self._prev_ticks
+        self._prev_value = value
+        self._prev_ticks = ticks_ms
+        if prev is None:
+            return False
+        dt = time.ticks_diff(ticks_ms, prev_ticks)
+        if dt <= 0:
+            return False
+        # коэффициент экспоненциального сглаживания для интервала dt
+        a = dt / (self.tau_ms + dt)
+        inst_rate = 1000 * (value - prev) / dt
+        # шум: отклонение мгновенной скорости от сглаженной
+        dev = inst_rate - self.rate
+        self.noise += a * ((dev if dev >= 0 else -dev) - self.noise)
+        self.rate += a * (inst_rate - self.rate)
+        # ошибка экспоненциального среднего меньше шума отдельного отсчета в sqrt((2 - a) / a) раз
+        self.rate_error = self.noise * (a / (2 - a)) ** 0.5
+        return self._decide(ticks_ms)
+
+    def _decide(self, ticks_ms: int) -> bool:
+        rate = self.rate if self.rate >= 0 else -self.rate
+        if AdaptiveController.SLOW == self.mode:
+            # изменение температуры должно быть заметно на фоне шума
+            if not (rate > self.fast_rate and rate > self.noise_factor * self.rate_error):
+                return False
+            new_mode = AdaptiveController.FAST
+        else:
+            # шум зависит от режима (в быстром режиме он больше), поэтому выход из быстрого режима
+            # определяется только порогом slow_rate: иначе скорость между порогами переключала бы режимы
+            if rate >= self.slow_rate:
+                return False
+            new_mode = AdaptiveController.SLOW
+        last = self._switch_ticks
+        if last is not None and time.ticks_diff(ticks_ms, last) < self.min_switch_interval_ms:
+            return False
+        self.set_mode(new_mode, ticks_ms)
+        return True
+
+    def set_mode(self, mode: int, ticks_ms: int | None = None):
+        """Принудительно устанавливает режим FAST или SLOW (одна запись регистра конфигурации)"""
+        conv, avg = self.fast if AdaptiveController.FAST == mode else self.slow
+        sensor = self._sensor
+        sensor.conversion_cycle_time = conv
+        sensor.average = avg
+        sensor.set_config()
+        self.mode = mode
+        self.switches += 1
+        self._switch_ticks = time.ticks_ms() if ticks_ms is None else ticks_ms
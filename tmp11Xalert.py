@@ -0,0 +1,100 @@
+# micropython
+# MIT license
+"""Обработка тревог температурного компаратора TMP117/TMP119 по прерыванию, без опроса is_over_threshold.
+
+Компаратор работает в режиме прерывания (CompMode.INTERRUPT): при выходе температуры за порог датчик
+устанавливает флаг HIGH_Alert или LOW_Alert и переводит вывод ALERT в активное состояние до чтения
+регистра конфигурации. Опрос is_over_threshold в цикле измерений занимает шину и, читая регистр,
+подтверждает (сбрасывает) тревогу, поэтому событие может быть потеряно.
+
+AlertEngine вместо этого:
+    - по фронту ALERT обработчик прерывания запоминает время (time.ticks_us) и планирует обработку
+      через micropython.schedule. Шина в прерывании не используется, память не выделяется;
+    - запланированный обработчик одним чтением регистра конфигурации определяет вид тревоги (High/Low),
+      тем же чтением подтверждает ее, записывает событие с временем прерывания в заранее выделенную
+      очередь и вызывает функции обратного вызова on_high(ticks_us) / on_low(ticks_us);
+    - основной код забирает события из очереди методом read_events. Очередь без блокировок:
+      обработчик изменяет только индекс записи, основной код - только индекс чтения.
+Шина используется только при срабатывании компаратора. Механизм прерываний и очереди -
+sensor_pack_2.irq_queue.IrqQueue.
+
+Пример:
+    def overheat(ticks_us):
+        fan.on()
+
+    engine = AlertEngine(ts, Pin(15, Pin.IN, Pin.PULL_UP), on_high=overheat)
+    engine.start(thresholds=(20.0, 30.0))
+"""
+
+from array import array
+from machine import Pin
+from sensor_pack_2.comp_interface import CompMode
+from sensor_pack_2.irq_queue import IrqQueue
+from tmp11Xtimod import TMP11X, TMP11XFlags
+
+
+class AlertEngine(IrqQueue):
+    """Событийная обработка тревог компаратора в режиме прерывания (CompMode.INTERRUPT).
+
+    Счетчики: missed - очередь micropython.schedule была переполнена (тревога обрабатывается при следующем
+    вызове available/read_events, см. IrqQueue), overruns - очередь событий была заполнена и событие отброшено,
+    spurious - после прерывания ни один флаг тревоги не был установлен (например, тревогу уже подтвердило
+    чтение регистра конфигурации основным кодом)."""
+    # виды событий
+    LOW = 1
+    HIGH = 2
+
+    def __init__(self, sensor: TMP11X, pin: Pin, on_high=None, on_low=None, capacity: int = 16,
+                 active_high: bool = False, hard: bool = True):
+        """sensor - драйвер датчика;
+        pin - вывод MCU, к которому подключен ALERT (открытый сток, нужен подтягивающий резистор!);
+        on_high, on_low - функции f(ticks_us) или None. Вызываются из запланированного обработчика,
+        а не из прерывания, поэтому могут выделять память и обращаться к шине;
+        capacity - размер очереди событий;
+        active_high - полярность сигнала ALERT (бит POL). False - активный низкий уровень;
+        hard - использовать "жесткое" прерывание, если порт MicroPython его поддерживает."""
+        super().__init__(pin, capacity, active_high, hard)
+        self._sensor = sensor
+        self.on_high = on_high
+        self.on_low = on_low
+        # собственные буфер чтения и флаги, независимые от основного кода
+        self._buf = bytearray(2)
+        self._flags = TMP11XFlags()
+
+    def start(self, thresholds: tuple[float, float] | None = None):
+        """Включает режим прерывания компаратора, при необходимости устанавливает пороги (°C)
+        и подключает обработчик прерывания. Вывод ALERT не должен быть настроен на Data Ready."""
+        sensor = self._sensor
+        if thresholds is not None:
+            sensor.set_thresholds(thresholds)
+        sensor.DR_Alert = False
+        sensor.set_comp_mode(CompMode.INTERRUPT, self._active_high)
+        self._attach()
+        # тревога, возникшая до подключения обработчика, не дала бы фронта: обработать ее сейчас
+        self._drain()
+
+    def stop(self):
+        """Отключает обработчик прерывания. Настройки компаратора не изменяются"""
+        self._detach()
+
+    def _process(self, ticks: int):
+        """Одно чтение регистра конфигурации (подтверждает тревогу и снимает ALERT), классификация
+        и вызов функций"""
+        flags = self._flags
+        self._sensor.read_status(flags, self._buf)
+        if not (flags.high_alert or flags.low_alert):
+            self.spurious += 1
+            return
+        if flags.high_alert:
+            self._push(AlertEngine.HIGH, ticks)
+            if self.on_high is not None:
+                self.on_high(ticks)
+        if flags.low_alert:
+            self._push(AlertEngine.LOW, ticks)
+            if self.on_low is not None:
+                self.on_low(ticks)
+
+    def read_events(self, ticks: array, kinds: bytearray | None = None) -> int:
+        """Переносит события из очереди: время прерывания в ticks, вид события (LOW/HIGH) в kinds, если не None.
+        Возвращает количество перенесенных событий."""
+        return self._read(kinds, ticks)
@@ -0,0 +1,81 @@
+# micropython
+# MIT license
+"""Асинхронный (asyncio) интерфейс драйвера TMP117/TMP119.
+
+Все ожидания драйвера (время преобразования, 2 мс после программного сброса, занятость EEPROM)
+выполняются через await asyncio.sleep_ms, а не блокирующий time.sleep_ms.
+Пока датчик измеряет, остальные задачи (сеть, дисплей, другие датчики) работают на том же ядре.
+
+Пример:
+    async def task(sensor: AsyncTMP11X):
+        async for val in sensor:
+            print(val)
+
+    ats = AsyncTMP11X(tmp11Xtimod.TMP11X(adapter))
+    asyncio.run(task(ats))
+"""
+
+try:
+    import asyncio
+except ImportError:
+    import uasyncio as asyncio
+from tmp11Xtimod import TMP11X, uid_tmp11X
+
+# время ожидания после программного сброса, мс (см. TMP11X.soft_reset)
+_SOFT_RESET_TIME_MS = 2
+
+
+class AsyncTMP11X:
+    """Асинхронная обертка над экземпляром TMP11X. Обращения к шине остаются синхронными (они короткие),
+    асинхронными становятся только ожидания."""
+
+    def __init__(self, sensor: TMP11X):
+        self.sensor = sensor
+
+    async def read(self) -> float | None:
+        """Ожидает ровно get_conversion_cycle_time() мс и возвращает температуру в °C.
+        В режиме однократных измерений (One-shot) перед ожиданием запускает преобразование."""
+        sensor = self.sensor
+        if 3 == sensor.conversion_mode:
+            sensor.set_config()     # запуск однократного преобразования
+        await asyncio.sleep_ms(sensor.get_conversion_cycle_time())
+        return sensor.get_measurement_value()
+
+    async def soft_reset(self) -> int:
+        """Программный сброс датчика с ожиданием его завершения.
+        Возвращает конфигурацию, загруженную датчиком из EEPROM (см. TMP11X.get_config)."""
+        self.sensor.soft_reset()
+        await asyncio.sleep_ms(_SOFT_RESET_TIME_MS)
+        return self.sensor.get_config()
+
+    async def wait_eeprom(self, timeout_ms: int = 50, first_ms: int = 0):
+        """Асинхронный аналог TMP11X.wait_eeprom (те же паузы, см. TMP11X.wait_eeprom_steps)"""
+        for ms in self.sensor.wait_eeprom_steps(timeout_ms, first_ms):
+            await asyncio.sleep_ms(ms)
+
+    async def program_eeprom(self, config: int | None = None, thresholds: tuple[int, int] | None = None,
+                             offset: int | None = None, reload: bool = True, timeout_ms: int = 50) -> int:
+        """Асинхронный аналог TMP11X.program_eeprom: та же последовательность (TMP11X.program_eeprom_steps),
+        но ~7 мс программирования каждого регистра и программный сброс ожидаются через await,
+        другие задачи в это время работают. Возвращает количество запрограммированных регистров."""
+        steps = self.sensor.program_eeprom_steps(config, thresholds, offset, reload, timeout_ms)
+        try:
+            while True:
+                await asyncio.sleep_ms(next(steps))
+        except StopIteration as e:
+            return e.value
+        finally:
+            # при отмене задачи EEPROM блокируется сразу, а не при сборке мусора
+            steps.close()
+
+    async def get_uid(self) -> uid_tmp11X:
+        """Возвращает уникальный ID датчика, дождавшись готовности EEPROM (см. TMP11X.get_uid)"""
+        await self.wait_eeprom()
+        return self.sensor.get_uid()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> float | None:
+        """Асинхронный аналог итератора TMP11X: каждое значение выдается по завершении преобразования"""
+        return await self.read()
@@ -0,0 +1,71 @@
+# micropython
+# MIT license
+"""Пакетное преобразование сырых значений регистра температуры TMP117/TMP119.
+
+Функции обрабатывают массив array('h') (или memoryview) сырых значений целиком и записывают результат
+в заранее выделенный массив: array('f') для °C или array('i') для целых милли-градусов (m°C).
+Целочисленный вариант не использует float вовсе, что важно для портов без аппаратной поддержки float.
+
+На MicroPython цикл преобразования в m°C компилируется декоратором @micropython.viper,
+на CPython (обработка журналов на компьютере) используется эквивалентный код на Python.
+
+Пример:
+    raw = array("h", ...)               # например, SampleRing.copy_raw_into
+    mc = array("i", bytes(4 * len(raw)))
+    raw_to_millicelsius_into(raw, mc)   # 2560 -> 20000 (20.000 °C)
+"""
+
+import sys
+
+# цена младшего разряда, °C
+_SCALE = 7.8125E-3
+
+if "micropython" == sys.implementation.name:
+    import micropython
+
+    @micropython.viper
+    def _to_milli(src: ptr16, dst: ptr32, n: int):
+        for i in range(n):
+            v = int(src[i])
+            if v & 0x8000:
+                v -= 0x10000
+            # 1 LSB = 7.8125 m°C = 125/16 m°C, с округлением к ближайшему
+            dst[i] = (v * 125 + 8) >> 4
+
+    @micropython.native
+    def _to_celsius(src, dst, n: int, scale: float):
+        for i in range(n):
+            dst[i] = src[i] * scale
+else:
+    def _to_milli(src, dst, n: int):
+        for i in range(n):
+            dst[i] = (src[i] * 125 + 8) >> 4
+
+    def _to_celsius(src, dst, n: int, scale: float):
+        for i in range(n):
+            dst[i] = src[i] * scale
+
+
+def _count(src, dst, n: int | None) -> int:
+    lim = len(src) if len(src) < len(dst) else len(dst)
+    if n is None or n > lim:
+        return lim
+    return n
+
+
+def raw_to_millicelsius_into(src, dst, n: int | None = None) -> int:
+    """Преобразует n сырых значений int16 из src в милли-градусы Цельсия (int32) в dst.
+    src - array('h') или memoryview; dst - array('i') (int32). Если n is None, преобразуется
+    min(len(src), len(dst)) значений. Возвращает количество преобразованных значений."""
+    n = _count(src, dst, n)
+    _to_milli(src, dst, n)
+    return n
+
+
+def raw_to_celsius_into(src, dst, n: int | None = None) -> int:
+    """Преобразует n сырых значений int16 из src в °C (float) в dst.
+    src - array('h') или memoryview; dst - array('f'). Если n is None, преобразуется
+    min(len(src), len(dst)) значений. Возвращает количество преобразованных значений."""
+    n = _count(src, dst, n)
+    _to_celsius(src, dst, n, _SCALE)
+    return n
@@ -0,0 +1,218 @@
+# MIT license
+"""Запуск драйвера TMP11X и модулей tmp11X* на компьютере (CPython): CI, тесты, профилирование.
+
+Драйвер импортирует встроенные модули MicroPython micropython и machine и пользуется функциями time,
+которых нет в CPython (ticks_us, ticks_ms, ticks_diff, ticks_add, sleep_ms, sleep_us). install() регистрирует
+заменители только для того, чего нет:
+    - micropython: const, native, viper (декораторы без компиляции), schedule, alloc_emergency_exception_buf;
+    - machine: Pin (с irq и value), I2C, SPI (заглушки: используйте tmp11Xsim.SimI2C), RTC (memory в ОЗУ),
+      lightsleep; deepsleep возбуждает NotImplementedError;
+    - time: ticks_* с переполнением через 2**30, как в большинстве портов MicroPython, sleep_ms, sleep_us;
+    - asyncio.sleep_ms.
+На MicroPython install() ничего не делает. tmp11Xsim вызывает install() при импорте.
+
+micropython.schedule, как и в MicroPython, ставит функцию в очередь из SCHEDULER_DEPTH элементов
+(RuntimeError при переполнении). Очередь выполняется функцией run_scheduled(), а также заменителями
+time.sleep_ms/sleep_us и asyncio.sleep_ms, то есть там, где ее выполнил бы MicroPython.
+
+use_clock(bus) направляет time.ticks_*, time.sleep_* и asyncio.sleep_ms на виртуальное время модели
+tmp11Xsim.SimI2C: паузы драйвера продвигают модель мгновенно и детерминированно.
+
+Пример:
+    from tmp11Xsim import SimI2C, TMP11XSim     # install() уже вызван
+    import tmp11Xhost
+    import tmp11Xtimod
+    bus = SimI2C()
+    tmp11Xhost.use_clock(bus)
+"""
+
+import sys
+import time
+
+# период переполнения time.ticks_* (MICROPY_PY_UTIME_TICKS_PERIOD)
+TICKS_PERIOD = 1 << 30
+_TICKS_MAX = TICKS_PERIOD - 1
+_TICKS_HALF = TICKS_PERIOD // 2
+
+# глубина очереди micropython.schedule (MICROPY_SCHEDULER_DEPTH)
+SCHEDULER_DEPTH = 4
+
+# очередь micropython.schedule: пары (функция, аргумент)
+_scheduled = []
+# источник виртуального времени (tmp11Xsim.SimI2C) или None
+_clock = None
+_t0_ns = time.monotonic_ns()
+
+
+def _ticks_us() -> int:
+    if _clock is not None:
+        return _clock.now_us() & _TICKS_MAX
+    return ((time.monotonic_ns() - _t0_ns) // 1000) & _TICKS_MAX
+
+
+def _ticks_ms() -> int:
+    if _clock is not None:
+        return (_clock.now_us() // 1000) & _TICKS_MAX
+    return ((time.monotonic_ns() - _t0_ns) // 1_000_000) & _TICKS_MAX
+
+
+def _ticks_add(ticks: int, delta: int) -> int:
+    return (ticks + delta) & _TICKS_MAX
+
+
+def _ticks_diff(end: int, start: int) -> int:
+    return ((end - start + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+
+
+def _schedule(func, arg):
+    if len(_scheduled) >= SCHEDULER_DEPTH:
+        raise RuntimeError("schedule queue full")
+    _scheduled.append((func, arg))
+
+
+def run_scheduled() -> int:
+    """Выполняет функции, поставленные в очередь micropython.schedule. Возвращает их количество"""
+    n = 0
+    while _scheduled:
+        func, arg = _scheduled.pop(0)
+        func(arg)
+        n += 1
+    return n
+
+
+def _sleep_us(us: int):
+    if us > 0:
+        if _clock is not None:
+            _clock.sleep_us(us)
+        else:
+            time.sleep(us / 1_000_000)
+    run_scheduled()
+
+
+def _sleep_ms(ms: int):
+    _sleep_us(1000 * ms)
+
+
+async def _async_sleep_ms(ms: int):
+    import asyncio
+    if _clock is not None:
+        _clock.sleep_ms(ms)
+        run_scheduled()
+        await asyncio.sleep(0)
+    else:
+        await asyncio.sleep(ms / 1000)
+        run_scheduled()
+
+
+def _make_micropython():
+    mod = type(sys)("micropython")
+
+    def const(value):
+        return value
+
+    def native(func):
+        return func
+
+    def alloc_emergency_exception_buf(size: int):
+        pass
+
+    mod.const = const
+    mod.native = native
+    mod.viper = native
+    mod.schedule = _schedule
+    mod.alloc_emergency_exception_buf = alloc_emergency_exception_buf
+    return mod
+
+
+class Pin:
+    """Заменитель machine.Pin. Уровень задается методом value(level), обработчик прерывания
+    вызывается при смене уровня в направлении, заданном trigger (имитация IRQ)."""
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+
+    def __init__(self, pin_id=None, mode: int = -1, pull: int = -1, value: int = 1):
+        self.id = pin_id
+        self._value = value
+        self.handler = None
+        self.trigger = 0
+
+    def value(self, level=None):
+        if level is None:
+            return self._value
+        old = self._value
+        self._value = int(bool(level))
+        handler = self.handler
+        if handler is not None and old != self._value:
+            edge = Pin.IRQ_RISING if self._value else Pin.IRQ_FALLING
+            if self.trigger & edge:
+                handler(self)
+
+    def irq(self, handler=None, trigger: int = IRQ_FALLING | IRQ_RISING, hard: bool = False):
+        self.handler = handler
+        self.trigger = trigger
+
+
+class _Bus:
+    """Заменитель machine.I2C/machine.SPI: на компьютере реальной шины нет, используйте tmp11Xsim.SimI2C"""
+
+    def __init__(self, *args, **kwargs):
+        raise NotImplementedError("На компьютере нет шины! Используйте tmp11Xsim.SimI2C.")
+
+
+class RTC:
+    """Заменитель machine.RTC: memory() хранится в ОЗУ процесса (общая для всех экземпляров)"""
+    _memory = b""
+
+    def memory(self, data=None):
+        if data is None:
+            return RTC._memory
+        RTC._memory = bytes(data)
+
+
+def _make_machine():
+    mod = type(sys)("machine")
+    mod.Pin = Pin
+    mod.I2C = type("I2C", (_Bus,), {})
+    mod.SPI = type("SPI", (_Bus,), {})
+    mod.RTC = RTC
+    mod.lightsleep = _sleep_ms
+
+    def deepsleep(ms: int = 0):
+        raise NotImplementedError("deepsleep на компьютере не поддерживается!")
+
+    mod.deepsleep = deepsleep
+    return mod
+
+
+def install():
+    """Регистрирует заменители модулей и функций MicroPython, которых нет в текущей реализации Python"""
+    if "micropython" == sys.implementation.name:
+        return
+    try:
+        import micropython
+    except ImportError:
+        sys.modules["micropython"] = _make_micropython()
+    try:
+        import machine
+    except ImportError:
+        sys.modules["machine"] = _make_machine()
+    for name, func in (("ticks_us", _ticks_us), ("ticks_ms", _ticks_ms), ("ticks_add", _ticks_add),
+                       ("ticks_diff", _ticks_diff), ("sleep_us", _sleep_us), ("sleep_ms", _sleep_ms)):
+        if not hasattr(time, name):
+            setattr(time, name, func)
+    import asyncio
+    if not hasattr(asyncio, "sleep_ms"):
+        asyncio.sleep_ms = _async_sleep_ms
+
+
+def use_clock(clock):
+    """Направляет заменители time.ticks_*, time.sleep_*, machine.lightsleep и asyncio.sleep_ms на время
+    модели clock (tmp11Xsim.SimI2C). None - вернуть реальное время.
+    Действует только на функции, установленные install(), а не на функции MicroPython."""
+    global _clock
+    _clock = clock
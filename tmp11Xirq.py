@@ -0,0 +1,75 @@
+# micropython
+# MIT license
+"""Получение данных TMP117/TMP119 по прерыванию от вывода ALERT в режиме Data Ready.
+
+Вывод ALERT датчика настраивается на сигнал готовности данных (бит DR/Alert регистра конфигурации).
+По фронту сигнала обработчик прерывания запоминает время (time.ticks_us) и планирует чтение регистра TEMP
+через micropython.schedule. Запланированный обработчик читает значение в заранее выделенный
+кольцевой буфер. Опрос регистра конфигурации не нужен: процессор не тратит время на ожидание,
+флаги HIGH/LOW Alert не сбрасываются лишними чтениями CONFIG. Механизм прерываний и очереди -
+sensor_pack_2.irq_queue.IrqQueue.
+
+Пример:
+    ts = tmp11Xtimod.TMP11X(adapter)
+    acq = DataReadyReader(ts, Pin(15, Pin.IN, Pin.PULL_UP), capacity=64)
+    acq.start(conv_cycle_time=0, average_mode=0)   # 16 мс, без усреднения
+    raw = array("h", 16 * [0])
+    while True:
+        n = acq.read_into(raw)
+        ...
+"""
+
+from array import array
+from machine import Pin
+from sensor_pack_2.irq_queue import IrqQueue
+from tmp11Xtimod import TMP11X
+
+
+class DataReadyReader(IrqQueue):
+    """Чтение температуры по сигналу Data Ready на выводе ALERT.
+
+    Кольцевой буфер на capacity - 1 отсчетов заполняется запланированным обработчиком (производитель),
+    а читается основным кодом методом read_into (потребитель). Если буфер полон, новый отсчет отбрасывается
+    и увеличивается счетчик overruns. Если очередь micropython.schedule переполнена, увеличивается
+    счетчик missed.
+
+    Пропущенное чтение нужно выполнить обязательно: пока регистр TEMP не прочитан, флаг Data_Ready
+    не сбрасывается, ALERT остается в активном состоянии и нового фронта (а значит и прерывания) не будет,
+    сбор данных остановится. Поэтому available и read_into сначала проверяют вывод: если он активен,
+    а чтение не запланировано, отсчет читается сразу (с временем проверки вместо времени прерывания)."""
+
+    def __init__(self, sensor: TMP11X, pin: Pin, capacity: int = 64, active_high: bool = False, hard: bool = True):
+        """sensor - драйвер датчика;
+        pin - вывод MCU, к которому подключен ALERT (открытый сток, нужен подтягивающий резистор!);
+        capacity - размер кольцевого буфера;
+        active_high - полярность сигнала ALERT (бит POL). False - активный низкий уровень;
+        hard - использовать "жесткое" прерывание, если порт MicroPython его поддерживает."""
+        super().__init__(pin, capacity, active_high, hard)
+        self._sensor = sensor
+        # собственный буфер чтения, независимый от буфера драйвера
+        self._buf = bytearray(2)
+
+    def start(self, conv_cycle_time: int = 4, average_mode: int = 1):
+        """Настраивает ALERT на сигнал Data Ready, подключает обработчик прерывания
+        и запускает непрерывные преобразования с заданными параметрами."""
+        sensor = self._sensor
+        sensor.DR_Alert = True
+        sensor.POL = self._active_high
+        self._attach()
+        sensor.start_measurement(single_shot=False, conv_cycle_time=conv_cycle_time, average_mode=average_mode)
+
+    def stop(self):
+        """Отключает обработчик прерывания и возвращает ALERT в режим компаратора"""
+        self._detach()
+        sensor = self._sensor
+        sensor.DR_Alert = False
+        sensor.set_config()
+
+    def _process(self, ticks: int):
+        """Чтение регистра TEMP в кольцевой буфер. Чтение сбрасывает Data_Ready и снимает сигнал ALERT"""
+        self._push(self._sensor.get_measurement_raw(self._buf), ticks)
+
+    def read_into(self, raw: array, ticks: array | None = None) -> int:
+        """Переносит отсчеты из кольцевого буфера в raw (и время прерывания в ticks, если не None).
+        Возвращает количество перенесенных отсчетов. 1 LSB = 7.8125 m°C."""
+        return self._read(raw, ticks)
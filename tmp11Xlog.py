@@ -0,0 +1,209 @@
+# micropython
+# MIT license
+"""Компактный двоичный журнал сырых значений температуры TMP117/TMP119 для хранения во флэш-памяти.
+
+Строка CSV вида "20.1171875\\n" занимает около 20 байт на отсчет. В журнале хранятся сырые значения
+регистра TEMP (int16, 1 LSB = 7.8125 m°C) в виде разностей соседних отсчетов, закодированных zigzag + varint:
+разность от -63 до 63 LSB (+/- 0.49 °C) занимает 1 байт, до +/- 8191 LSB - 2 байта, любая другая - 3 байта.
+Медленно меняющаяся температура сжимается примерно до 1 байта на отсчет.
+
+Формат файла (little-endian):
+    заголовок, HEADER_SIZE байт:
+        magic (4 байта b"TMPL"), version (uint8), reserved (uint8), block_size (uint16),
+        uid (3 x uint16, TMP11X.get_uid), config (uint16, слово конфигурации), start_ticks (uint32),
+        period_ms (uint32, номинальный период отсчетов, 0 - неизвестен);
+    блоки по block_size байт, каждый декодируется независимо от других (произвольный доступ по номеру блока):
+        index (uint32, номер первого отсчета блока), count (uint16, количество отсчетов), first (int16, первый отсчет),
+        count - 1 разностей в формате zigzag varint, остаток блока заполнен нулями.
+
+LogWriter накапливает блок в заранее выделенном буфере и записывает его в файл целиком, только когда он заполнен,
+поэтому запись во флэш-память идет крупными порциями фиксированного размера.
+Модуль не зависит от machine и micropython и может использоваться на компьютере.
+
+Пример:
+    with open("t.log", "wb") as f:
+        log = LogWriter(f, uid=sensor.get_uid(), config=sensor.get_config_word(),
+                        start_ticks=time.ticks_ms(), period_ms=sensor.get_conversion_cycle_time())
+        for _ in range(86_400):
+            log.append(sensor.get_measurement_raw())
+            ...
+        log.close()
+"""
+
+import struct
+from array import array
+from collections import namedtuple
+
+MAGIC = b"TMPL"
+VERSION = 1
+# формат и размер заголовка файла
+HEADER_FMT = "<4sBBH3HHII"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+# формат и размер заголовка блока
+BLOCK_FMT = "<IHh"
+BLOCK_HEADER_SIZE = struct.calcsize(BLOCK_FMT)
+# максимальная длина разности int16 в формате varint, байт
+_MAX_VARINT = 3
+
+# Тип для заголовка журнала
+log_header = namedtuple("log_header", "block_size uid config start_ticks period_ms")
+
+
+def parse_header(buf) -> log_header:
+    """Разбирает заголовок журнала (первые HEADER_SIZE байт buf)"""
+    if len(buf) < HEADER_SIZE:
+        raise ValueError("Неверный заголовок журнала!")
+    magic, version, _, block_size, u0, u1, u2, config, start_ticks, period_ms = struct.unpack_from(HEADER_FMT, buf, 0)
+    if MAGIC != magic or VERSION != version:
+        raise ValueError(f"Неподдерживаемый формат журнала: {magic}, {version}")
+    return log_header(block_size=block_size, uid=(u0, u1, u2), config=config, start_ticks=start_ticks,
+                      period_ms=period_ms)
+
+
+def decode_block(buf, offset: int, out, out_offset: int = 0) -> tuple:
+    """Декодирует блок, начинающийся с позиции offset буфера buf (bytes, bytearray, memoryview, mmap),
+    в out (array('h')), начиная с позиции out_offset.
+    Возвращает кортеж (номер первого отсчета блока, количество отсчетов)."""
+    index, count, val = struct.unpack_from(BLOCK_FMT, buf, offset)
+    if out_offset + count > len(out):
+        raise ValueError(f"Буфер мал для блока: {len(out) - out_offset} < {count}")
+    if 0 == count:
+        return index, 0
+    out[out_offset] = val
+    pos = offset + BLOCK_HEADER_SIZE
+    for i in range(out_offset + 1, out_offset + count):
+        z = 0
+        shift = 0
+        while True:
+            b = buf[pos]
+            pos += 1
+            z |= (b & 0x7F) << shift
+            if b < 0x80:
+                break
+            shift += 7
+        val += -((z + 1) >> 1) if z & 1 else z >> 1
+        out[i] = val
+    return index, count
+
+
+def max_block_samples(block_size: int) -> int:
+    """Наибольшее возможное количество отсчетов в блоке размером block_size байт"""
+    return block_size - BLOCK_HEADER_SIZE + 1
+
+
+class LogWriter:
+    """Потоковая запись журнала блоками фиксированного размера"""
+
+    def __init__(self, stream, uid: tuple = (0, 0, 0), config: int = 0, start_ticks: int = 0,
+                 period_ms: int = 0, block_size: int = 512):
+        """stream - файл, открытый на запись в двоичном режиме;
+        uid - уникальный ID датчика (TMP11X.get_uid), три 16-битных слова;
+        config - слово конфигурации датчика (TMP11X.get_config_word);
+        start_ticks - время первого отсчета (например, time.ticks_ms());
+        period_ms - номинальный период отсчетов, мс;
+        block_size - размер блока в байтах. Рекомендуется делитель размера страницы флэш-памяти."""
+        if block_size < BLOCK_HEADER_SIZE + _MAX_VARINT or block_size > 0xFFFF:
+            raise ValueError(f"Неверное значение block_size: {block_size}")
+        self._stream = stream
+        self.block_size = block_size
+        self._block = bytearray(block_size)
+        # номер следующего отсчета, количество отсчетов в текущем блоке и позиция записи в нем
+        self._index = 0
+        self._count = 0
+        self._pos = 0
+        self._prev = 0
+        # количество записанных блоков
+        self.blocks = 0
+        stream.write(struct.pack(HEADER_FMT, MAGIC, VERSION, 0, block_size, uid[0], uid[1], uid[2],
+                                 config, start_ticks & 0xFFFF_FFFF, period_ms))
+
+    @property
+    def count(self) -> int:
+        """Количество отсчетов, добавленных в журнал"""
+        return self._index
+
+    def append(self, raw: int):
+        """Добавляет сырое значение int16 (TMP11X.get_measurement_raw)"""
+        if 0 == self._count:
+            struct.pack_into(BLOCK_FMT, self._block, 0, self._index, 0, raw)
+            self._pos = BLOCK_HEADER_SIZE
+        else:
+            if self._pos + _MAX_VARINT > self.block_size:
+                self.flush()
+                self.append(raw)
+                return
+            d = raw - self._prev
+            # zigzag: 0, -1, 1, -2, 2... -> 0, 1, 2, 3, 4...
+            z = d << 1 if d >= 0 else ((-d) << 1) - 1
+            buf = self._block
+            pos = self._pos
+            while z > 0x7F:
+                buf[pos] = 0x80 | (z & 0x7F)
+                z >>= 7
+                pos += 1
+            buf[pos] = z
+            self._pos = pos + 1
+        self._prev = raw
+        self._count += 1
+        self._index += 1
+
+    def flush(self):
+        """Записывает текущий блок, даже если он заполнен не полностью. Следующий отсчет начнет новый блок"""
+        count = self._count
+        if 0 == count:
+            return
+        buf = self._block
+        struct.pack_into("<H", buf, 4, count)
+        for i in range(self._pos, self.block_size):
+            buf[i] = 0
+        self._stream.write(buf)
+        self.blocks += 1
+        self._count = 0
+
+    def close(self):
+        """Записывает незавершенный блок и сбрасывает буферы файла. Файл не закрывается"""
+        self.flush()
+        self._stream.flush()
+
+
+class LogReader:
+    """Чтение журнала с произвольным доступом по номеру блока"""
+
+    def __init__(self, stream):
+        """stream - файл журнала, открытый на чтение в двоичном режиме (с поддержкой seek)"""
+        self._stream = stream
+        hdr = parse_header(stream.read(HEADER_SIZE))
+        block_size = hdr.block_size
+        self.block_size = block_size
+        self.uid = hdr.uid
+        self.config = hdr.config
+        self.start_ticks = hdr.start_ticks
+        self.period_ms = hdr.period_ms
+        self._block = bytearray(block_size)
+        size = stream.seek(0, 2)
+        self.blocks = (size - HEADER_SIZE) // block_size
+
+    def read_block(self, k: int, out: array) -> tuple:
+        """Декодирует блок номер k в out (array('h') длиной не менее числа отсчетов блока).
+        Возвращает кортеж (номер первого отсчета блока, количество отсчетов)."""
+        if k < 0:
+            k += self.blocks
+        if k < 0 or k >= self.blocks:
+            raise IndexError("LogReader block index out of range")
+        stream = self._stream
+        buf = self._block
+        stream.seek(HEADER_SIZE + k * self.block_size)
+        stream.readinto(buf)
+        return decode_block(buf, 0, out)
+
+    def max_block_samples(self) -> int:
+        """Наибольшее возможное количество отсчетов в блоке (размер буфера для read_block)"""
+        return max_block_samples(self.block_size)
+
+    def __iter__(self):
+        """Генератор всех сырых значений журнала, от старых к новым"""
+        out = array("h", bytes(2 * self.max_block_samples()))
+        for k in range(self.blocks):
+            _, count = self.read_block(k, out)
+            for i in range(count):
+                yield out[i]
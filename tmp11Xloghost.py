@@ -0,0 +1,170 @@
+# MIT license
+"""Чтение больших журналов tmp11Xlog на компьютере (CPython) за постоянный объем памяти.
+
+Файл журнала отображается в память (mmap), поэтому операционная система читает с диска только те блоки,
+к которым идет обращение, и файл любого размера не загружается в память целиком.
+Отсчеты хранятся в виде разностей в формате varint, поэтому непосредственно отобразить их на int16 нельзя:
+блоки декодируются порциями в один и тот же заранее выделенный буфер int16, а наружу выдается представление
+этого буфера без копирования - memoryview или, если установлен NumPy, numpy.ndarray (numpy.frombuffer).
+С NumPy декодирование блока векторизовано. Преобразование в °C выполняется только по запросу (celsius).
+
+Порции удобно передавать в потоковую статистику (sensor_pack_2.stats.RawStreamStats), которая
+также использует постоянный объем памяти.
+
+Пример:
+    with LogFile("fleet_0042.log") as log:
+        st = log.stats()
+        print(log.uid, st.result())
+        for index, raw in log.chunks():
+            temp = log.celsius(raw)
+            ...
+"""
+
+import mmap
+import struct
+from array import array
+from sensor_pack_2.stats import RawStreamStats
+from tmp11Xconv import raw_to_celsius_into
+from tmp11Xlog import HEADER_SIZE, BLOCK_FMT, BLOCK_HEADER_SIZE, parse_header, decode_block, max_block_samples
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# цена младшего разряда, °C
+RESOLUTION = 7.8125E-3
+# значение регистра TEMP "нет данных" (пропущенное преобразование, см. tmp11Xpipeline)
+NO_DATA = -32768
+
+
+def _decode_block_np(mm, offset: int, block_size: int, out, out_offset: int) -> tuple:
+    """Векторизованный (NumPy) аналог tmp11Xlog.decode_block. out - numpy.ndarray int16"""
+    index, count, first = struct.unpack_from(BLOCK_FMT, mm, offset)
+    if out_offset + count > len(out):
+        raise ValueError(f"Буфер мал для блока: {len(out) - out_offset} < {count}")
+    if 0 == count:
+        return index, 0
+    out[out_offset] = first
+    if count > 1:
+        b = numpy.frombuffer(mm, dtype=numpy.uint8, count=block_size - BLOCK_HEADER_SIZE,
+                             offset=offset + BLOCK_HEADER_SIZE)
+        # последний байт каждого числа varint - байт без старшего бита
+        ends = numpy.flatnonzero(b < 0x80)[:count - 1]
+        b = b[:ends[-1] + 1]
+        starts = numpy.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        # номер байта внутри числа varint
+        pos = numpy.arange(len(b)) - numpy.repeat(starts, ends - starts + 1)
+        z = numpy.add.reduceat((b & 0x7F).astype(numpy.int64) << (7 * pos), starts)
+        # zigzag -> разность
+        d = (z >> 1) ^ -(z & 1)
+        out[out_offset + 1:out_offset + count] = first + numpy.cumsum(d)
+    return index, count
+
+
+class LogFile:
+    """Журнал tmp11Xlog, отображенный в память"""
+
+    def __init__(self, path: str, use_numpy: bool | None = None):
+        """path - путь к файлу журнала;
+        use_numpy - использовать NumPy. None - если установлен."""
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy не установлен!")
+        self._use_numpy = use_numpy
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        hdr = parse_header(self._mm)
+        self.block_size = hdr.block_size
+        self.uid = hdr.uid
+        self.config = hdr.config
+        self.start_ticks = hdr.start_ticks
+        self.period_ms = hdr.period_ms
+        self.blocks = (len(self._mm) - HEADER_SIZE) // self.block_size
+        self._buf = None
+        self._buf_len = 0
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _get_buf(self, n: int):
+        """Буфер int16 не меньше n отсчетов; выделяется заново, только если нужен больший"""
+        if n > self._buf_len:
+            self._buf = numpy.empty(n, dtype=numpy.int16) if self._use_numpy else array("h", bytes(2 * n))
+            self._buf_len = n
+        return self._buf
+
+    def _view(self, buf, n: int):
+        """Представление первых n отсчетов буфера без копирования"""
+        return buf[:n] if self._use_numpy else memoryview(buf)[:n]
+
+    def _decode(self, k: int, out, out_offset: int) -> tuple:
+        offset = HEADER_SIZE + k * self.block_size
+        if self._use_numpy:
+            return _decode_block_np(self._mm, offset, self.block_size, out, out_offset)
+        return decode_block(self._mm, offset, out, out_offset)
+
+    def block(self, k: int) -> tuple:
+        """Декодирует блок номер k. Возвращает кортеж (номер первого отсчета, отсчеты int16).
+        Отсчеты - представление внутреннего буфера, действительное до следующего обращения к журналу."""
+        if k < 0:
+            k += self.blocks
+        if k < 0 or k >= self.blocks:
+            raise IndexError("LogFile block index out of range")
+        buf = self._get_buf(max_block_samples(self.block_size))
+        index, count = self._decode(k, buf, 0)
+        return index, self._view(buf, count)
+
+    def chunks(self, blocks_per_chunk: int = 256, start_block: int = 0):
+        """Генератор порций: кортежей (номер первого отсчета, отсчеты int16) по blocks_per_chunk блоков.
+        Все порции декодируются в один буфер, поэтому обработайте или скопируйте порцию до получения следующей."""
+        buf = self._get_buf(blocks_per_chunk * max_block_samples(self.block_size))
+        k = start_block
+        while k < self.blocks:
+            first_index = None
+            n = 0
+            for j in range(k, min(k + blocks_per_chunk, self.blocks)):
+                index, count = self._decode(j, buf, n)
+                if first_index is None:
+                    first_index = index
+                n += count
+            k += blocks_per_chunk
+            yield first_index, self._view(buf, n)
+
+    def __iter__(self):
+        """Генератор всех сырых значений журнала (int), от старых к новым"""
+        for _, raw in self.chunks():
+            yield from raw.tolist()
+
+    @staticmethod
+    def celsius(raw):
+        """Преобразует порцию сырых значений в °C: numpy.ndarray float64 или array('f')"""
+        if numpy is not None and isinstance(raw, numpy.ndarray):
+            return raw * RESOLUTION
+        dst = array("f", bytes(4 * len(raw)))
+        raw_to_celsius_into(raw, dst)
+        return dst
+
+    def stats(self, skip_no_data: bool = True, bins: int = 1024, bin_width: int = 1) -> RawStreamStats:
+        """Потоковая статистика всех отсчетов журнала (RawStreamStats со scale = 7.8125E-3 °C).
+        skip_no_data - не учитывать значения NO_DATA (пропущенные преобразования)."""
+        st = RawStreamStats(scale=RESOLUTION, bins=bins, bin_width=bin_width)
+        add_raw = st.add_raw
+        for _, raw in self.chunks():
+            for v in raw.tolist():
+                if skip_no_data and NO_DATA == v:
+                    continue
+                add_raw(v)
+        return st
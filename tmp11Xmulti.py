@@ -0,0 +1,130 @@
+# micropython
+# MIT license
+"""Группа датчиков TMP117/TMP119 на одной шине I2C (до четырех: адреса 0x48..0x4B, вывод ADD0).
+
+TMP11XArray запускает преобразования всех датчиков подряд, без промежуточных операций,
+поэтому циклы преобразования датчиков совпадают по фазе с точностью до времени нескольких транзакций на шине.
+Результаты всех датчиков читаются одним проходом в общий массив, вместе со временем чтения каждого.
+Разброс по времени (skew) запуска и чтения позволяет убедиться, что градиент температуры между
+датчиками измерен в одном окне преобразования.
+
+Пример:
+    group = TMP11XArray(adapter, (0x48, 0x49, 0x4A, 0x4B))
+    group.start(conv_cycle_time=4, average_mode=1)
+    while True:
+        time.sleep_ms(group.get_conversion_cycle_time())
+        raw = group.read_all()
+        print([group.get_celsius(i) for i in range(len(group))], group.read_skew_us)
+"""
+
+import time
+from array import array
+from sensor_pack_2 import bus_service
+from sensor_pack_2.base_sensor import check_range
+from tmp11Xtimod import TMP11X, _CONV_RANGE, _AVG_RANGE
+
+# допустимые адреса датчиков на шине
+_VALID_ADDRESSES = (0x48, 0x49, 0x4A, 0x4B)
+
+
+class TMP11XArray:
+    """Группа датчиков TMP11X на общем адаптере шины."""
+
+    def __init__(self, adapter: bus_service.BusAdapter, addresses: tuple = _VALID_ADDRESSES,
+                 cache_config: bool = True, adopt: bool = False):
+        """adapter - общий адаптер шины;
+        addresses - адреса датчиков (не более четырех, без повторов);
+        cache_config - передается в конструктор TMP11X (теневая копия конфигурации, см. TMP11X.__init__);
+        adopt - передается в конструктор TMP11X: принять текущую конфигурацию датчиков без записи."""
+        n = len(addresses)
+        if not 0 < n <= len(_VALID_ADDRESSES):
+            raise ValueError(f"Неверное количество датчиков: {n}")
+        for addr in addresses:
+            if addr not in _VALID_ADDRESSES:
+                raise ValueError(f"Неверный адрес датчика: 0x{addr:02X}")
+        if len(set(addresses)) != n:
+            raise ValueError(f"Адреса датчиков повторяются: {addresses}")
+        self.sensors = [TMP11X(adapter, addr, cache_config=cache_config, adopt=adopt) for addr in addresses]
+        # последние сырые значения температуры и время их чтения (мкс)
+        self.raw = array("h", bytes(2 * n))
+        self.ticks = array("I", bytes(4 * n))
+        # время записи конфигурации (запуска преобразования) каждого датчика (мкс)
+        self.start_ticks = array("I", bytes(4 * n))
+
+    def __len__(self) -> int:
+        return len(self.sensors)
+
+    def start(self, single_shot: bool = False, conv_cycle_time: int = 4, average_mode: int = 1) -> int:
+        """Запускает преобразования всех датчиков с одинаковыми настройками.
+        Сначала все датчики переводятся в Shutdown, затем подряд, без других операций, запускаются.
+        Так циклы преобразования начинаются практически одновременно.
+        Возвращает разброс времени запуска в мкс (start_skew_us).
+        Неверные значения вызывают исключение до первого обращения к шине: датчики и их поля не изменяются."""
+        conv = check_range(conv_cycle_time, _CONV_RANGE, "conversion_cycle_time")
+        avg = check_range(average_mode, _AVG_RANGE, "average_mode")
+        sensors = self.sensors
+        for sensor in sensors:
+            sensor.conversion_mode = 1  # Shutdown
+            sensor.set_config()
+        for sensor in sensors:
+            sensor.conversion_cycle_time = conv
+            sensor.average = avg
+            sensor.conversion_mode = 3 if single_shot else 2
+        self._write_all()
+        return self.start_skew_us
+
+    def trigger(self) -> int:
+        """Повторный запуск однократного (One-shot) преобразования всех датчиков.
+        Возвращает разброс времени запуска в мкс."""
+        self._write_all()
+        return self.start_skew_us
+
+    def _write_all(self):
+        start_ticks = self.start_ticks
+        i = 0
+        for sensor in self.sensors:
+            sensor.set_config()
+            start_ticks[i] = time.ticks_us()
+            i += 1
+
+    def get_conversion_cycle_time(self) -> int:
+        """Время преобразования группы в мс (максимальное среди датчиков)"""
+        t = 0
+        for sensor in self.sensors:
+            ct = sensor.get_conversion_cycle_time()
+            if ct > t:
+                t = ct
+        return t
+
+    def read_all(self) -> array:
+        """Читает температуру всех датчиков одним проходом в self.raw (1 LSB = 7.8125 m°C),
+        время чтения каждого датчика сохраняется в self.ticks. Память не выделяется. Возвращает self.raw"""
+        raw = self.raw
+        ticks = self.ticks
+        i = 0
+        for sensor in self.sensors:
+            raw[i] = sensor.get_measurement_raw()
+            ticks[i] = time.ticks_us()
+            i += 1
+        return raw
+
+    def get_celsius(self, index: int) -> float | None:
+        """Последнее прочитанное значение датчика с индексом index в °C или None, если данных еще нет"""
+        val = self.raw[index]
+        if -32768 == val:
+            return None
+        return TMP11X.RESOLUTION * val
+
+    @staticmethod
+    def _skew(ticks: array) -> int:
+        return time.ticks_diff(ticks[len(ticks) - 1], ticks[0])
+
+    @property
+    def start_skew_us(self) -> int:
+        """Разброс времени запуска преобразования между первым и последним датчиком, мкс"""
+        return self._skew(self.start_ticks)
+
+    @property
+    def read_skew_us(self) -> int:
+        """Разброс времени чтения результатов между первым и последним датчиком, мкс"""
+        return self._skew(self.ticks)
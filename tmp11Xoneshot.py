@@ -0,0 +1,85 @@
+# micropython
+# MIT license
+"""Планировщик однократных (One-shot) измерений TMP117/TMP119 с минимальными затратами энергии.
+
+Значение регистра конфигурации с MOD=11 рассчитывается и проверяется один раз, при создании планировщика,
+из текущих полей драйвера (CONV, POL, T/nA, DR/Alert) и заданного усреднения. Поля драйвера не изменяются.
+Каждое преобразование запускается одной записью этого значения, после чего планировщик ждет время
+однократного преобразования для выбранного усреднения (AVG) с небольшим запасом (wait_ms) и читает результат.
+Запас покрывает разброс частоты внутреннего генератора датчика: если прочитать TEMP до завершения
+преобразования, будет получено предыдущее значение, и по нему это не определить.
+После преобразования датчик сам переходит в режим Shutdown и почти не потребляет энергию до следующего запуска.
+
+Пример:
+    sched = OneShotScheduler(sensor, average=1, period_ms=10_000)   # 8 усреднений, раз в 10 секунд
+    sched.run(6, lambda raw, ticks: print(raw * sensor.RESOLUTION))
+"""
+
+import time
+from sensor_pack_2.base_sensor import check_range
+from tmp11Xtimod import TMP11X, get_conversion_time_ms, _AVG_RANGE
+
+# запас времени ожидания преобразования: 1 / _MARGIN_DIV его длительности плюс 1 мс
+_MARGIN_DIV = 16
+
+
+class OneShotScheduler:
+    """Периодические однократные измерения с заданным периодом"""
+
+    def __init__(self, sensor: TMP11X, average: int = 1, period_ms: int = 1000):
+        """sensor - драйвер датчика;
+        average - режим усреднения AVG (0..3: 1, 8, 32, 64 преобразования);
+        period_ms - период измерений (1000 / частота в Гц), не меньше времени преобразования."""
+        self._sensor = sensor
+        avg = check_range(average, _AVG_RANGE, "average")
+        # время однократного преобразования, мс
+        self.conversion_time_ms = get_conversion_time_ms(3, sensor.conversion_cycle_time, avg)
+        if period_ms < self.conversion_time_ms:
+            raise ValueError(f"Период {period_ms} мс меньше времени преобразования {self.conversion_time_ms} мс!")
+        # время ожидания результата после запуска преобразования, мс
+        self.wait_ms = self.conversion_time_ms + self.conversion_time_ms // _MARGIN_DIV + 1
+        self.period_ms = period_ms
+        # значение регистра конфигурации, запускающее преобразование: AVG=avg, MOD=11 (One-shot)
+        word = sensor.get_config_word() & ~((0b11 << 5) | (0b11 << 10))
+        self._trigger_word = word | (avg << 5) | (0b11 << 10)
+        # то же, но в режиме Shutdown (MOD=01)
+        self._shutdown_word = (self._trigger_word & ~(0b11 << 10)) | (0b01 << 10)
+
+    @property
+    def trigger_word(self) -> int:
+        """Значение регистра конфигурации, которое записывает trigger"""
+        return self._trigger_word
+
+    def trigger(self):
+        """Запускает однократное преобразование одной записью в регистр конфигурации"""
+        self._sensor.write_config_word(self._trigger_word)
+
+    def sample(self) -> int:
+        """Запускает преобразование, ждет его завершения и возвращает raw-значение (1 LSB = 7.8125 m°C).
+        После преобразования датчик находится в режиме Shutdown."""
+        self.trigger()
+        time.sleep_ms(self.wait_ms)
+        return self._sensor.get_measurement_raw()
+
+    def shutdown(self):
+        """Принудительно переводит датчик в режим Shutdown (например, если измерение прервано)"""
+        self._sensor.write_config_word(self._shutdown_word)
+
+    def run(self, count: int, callback):
+        """Выполняет count измерений (бесконечно, если count равен нулю) с периодом period_ms.
+        Для каждого измерения вызывает callback(raw, ticks_ms), где ticks_ms - время запуска преобразования.
+        Моменты запуска рассчитываются от первого, поэтому период не накапливает ошибку."""
+        deadline = time.ticks_ms()
+        i = 0
+        while 0 == count or i < count:
+            start = deadline
+            raw = self.sample()
+            callback(raw, start)
+            i += 1
+            deadline = time.ticks_add(deadline, self.period_ms)
+            wait = time.ticks_diff(deadline, time.ticks_ms())
+            if wait > 0:
+                time.sleep_ms(wait)
+            else:
+                # опоздание больше периода: новый отсчет времени
+                deadline = time.ticks_ms()
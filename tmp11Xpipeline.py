@@ -0,0 +1,169 @@
+# micropython
+# MIT license
+"""Поток отсчетов TMP117/TMP119 с метками времени, выровненными по циклу преобразования датчика.
+
+Цикл "time.sleep_ms(период); читать TEMP" идет по часам MCU, а датчик - по собственному генератору.
+Часы расходятся, поэтому такой цикл время от времени читает одно преобразование дважды или пропускает его,
+и понять это по значению нельзя. SamplePipeline вместо этого:
+    - просыпается незадолго до ожидаемого завершения преобразования и опрашивает флаг Data_Ready,
+      поэтому каждое преобразование читается ровно один раз (повторов нет);
+    - метка времени (time.ticks_us) - середина между последним опросом без данных и опросом с данными;
+    - каждое преобразование получает порядковый номер. Если интервал между преобразованиями превышает
+      период более чем в полтора раза, пропущенные преобразования учитываются в счетчике missed и
+      записываются в буфер значением -32768 (0x8000, "нет данных") с расчетной меткой времени,
+      поэтому номер отсчета в буфере равен номеру преобразования и ряд остается равномерным;
+      Если пропусков больше, чем помещается в буфер (долгая остановка), в буфер записываются только
+      последние capacity отсчетов, а в missed учитываются все пропущенные преобразования;
+    - фактический период преобразования датчика (period_us) уточняется по измеренным интервалам,
+      начиная с номинального (get_conversion_cycle_time), и используется для планирования следующего опроса.
+      Уточненный период ограничен диапазоном +/- 10 % от номинального (точность генератора датчика
+      намного лучше), поэтому ошибочные интервалы не уводят его сколь угодно далеко.
+Такой ряд подходит для спектрального анализа (БПФ) с частотой дискретизации 1E6 / period_us Гц.
+
+Пример:
+    sensor.start_measurement(conv_cycle_time=0, average_mode=0)    # 16 мс, без усреднения
+    pipe = SamplePipeline(sensor, capacity=1024)
+    pipe.run(1024)
+    print(pipe.missed, 1E6 / pipe.period_us)
+"""
+
+import time
+from sensor_pack_2.ring_buffer import SampleRing
+from tmp11Xtimod import TMP11X
+
+# значение регистра TEMP "нет данных"
+_NO_DATA = -32768
+# допустимое отклонение уточненного периода от номинального: 1 / _PERIOD_TOL (10 %)
+_PERIOD_TOL = 10
+
+
+class SamplePipeline:
+    """Чтение каждого преобразования датчика ровно один раз, с меткой времени в мкс и порядковым номером.
+    Датчик должен работать в режиме непрерывных измерений."""
+
+    def __init__(self, sensor: TMP11X, capacity: int = 256, poll_us: int = 250, guard_us: int | None = None):
+        """sensor - драйвер датчика в режиме непрерывных измерений;
+        capacity - емкость кольцевого буфера отсчетов (ring);
+        poll_us - интервал опроса флага Data_Ready, мкс. Определяет точность метки времени (+/- poll_us / 2);
+        guard_us - за сколько мкс до ожидаемого завершения преобразования начинать опрос.
+        По умолчанию 2 % периода, но не меньше 2 * poll_us."""
+        if sensor.conversion_mode in (1, 3):
+            raise ValueError("Датчик должен работать в режиме непрерывных измерений!")
+        self._sensor = sensor
+        self.poll_us = poll_us
+        # номинальный и уточненный период преобразования, мкс
+        self.nominal_us = 1000 * sensor.get_conversion_cycle_time()
+        self.period_us = self.nominal_us
+        self._period_min = self.nominal_us - self.nominal_us // _PERIOD_TOL
+        self._period_max = self.nominal_us + self.nominal_us // _PERIOD_TOL
+        if guard_us is None:
+            guard_us = self.nominal_us // 50
+            if guard_us < 2 * poll_us:
+                guard_us = 2 * poll_us
+        self.guard_us = guard_us
+        # отсчеты (raw, 1 LSB = 7.8125 m°C) и их метки времени time.ticks_us
+        self.ring = SampleRing(capacity, timestamps=True, scale=TMP11X.RESOLUTION)
+        # номер следующего преобразования
+        self.seq = 0
+        # количество пропущенных преобразований
+        self.missed = 0
+        # количество опросов Data_Ready, не заставших готовых данных
+        self.empty_polls = 0
+        self._last_ticks = None
+        # Истина, если момент завершения последнего преобразования заключен между двумя опросами
+        self._bracketed = False
+
+    def _poll(self) -> int:
+        """Опрашивает Data_Ready до его установки. Возвращает метку времени завершения преобразования, мкс"""
+        sensor = self._sensor
+        poll_us = self.poll_us
+        before = None
+        self._bracketed = False
+        while True:
+            t = time.ticks_us()
+            if sensor.get_data_status():
+                break
+            before = t
+            self.empty_polls += 1
+            time.sleep_us(poll_us)
+        if before is None:
+            # данные были готовы уже при первом опросе (опрос начат с опозданием).
+            # Время завершения неизвестно: используется последняя расчетная граница цикла датчика до момента t.
+            last = self._last_ticks
+            if last is None:
+                return t
+            period = self.period_us
+            k = time.ticks_diff(t, last) // period
+            if k < 1:
+                return t
+            return time.ticks_add(last, k * period)
+        self._bracketed = True
+        return time.ticks_add(before, time.ticks_diff(t, before) // 2)
+
+    def start(self):
+        """Синхронизация с циклом датчика: ждет завершения очередного преобразования и отбрасывает его.
+        Вызывается автоматически первым вызовом step."""
+        self._sensor.get_data_status()    # сброс Data_Ready, установленного ранее
+        self._last_ticks = None
+        self._last_ticks = self._poll()
+        self._sensor.get_measurement_raw()
+
+    def step(self) -> int:
+        """Ожидает следующее преобразование, читает его и добавляет в ring.
+        Возвращает количество преобразований с предыдущего шага: 1 плюс количество пропущенных.
+        В ring добавляется столько же отсчетов, но не больше его емкости (остаются самые новые)."""
+        if self._last_ticks is None:
+            self.start()
+        last = self._last_ticks
+        period = self.period_us
+        wait = time.ticks_diff(time.ticks_add(last, period - self.guard_us), time.ticks_us())
+        if wait > 0:
+            time.sleep_us(wait)
+        ticks = self._poll()
+        raw = self._sensor.get_measurement_raw()
+        interval = time.ticks_diff(ticks, last)
+        # количество периодов между этим и предыдущим преобразованием
+        n = (interval + period // 2) // period
+        if n < 1:
+            n = 1
+        ring = self.ring
+        # отсчеты, которые все равно были бы затерты, не записываются
+        first = n - ring.capacity + 1
+        if first < 1:
+            first = 1
+        for k in range(first, n):
+            ring.append(_NO_DATA, time.ticks_add(last, k * period))
+        ring.append(raw, ticks)
+        self.missed += n - 1
+        self.seq += n
+        if 1 == n and self._bracketed:
+            # уточнение периода по интервалу между соседними преобразованиями
+            period += (interval - period) // 16
+            if period < self._period_min:
+                period = self._period_min
+            elif period > self._period_max:
+                period = self._period_max
+            self.period_us = period
+        self._last_ticks = ticks
+        return n
+
+    def get_seq(self, i: int) -> int:
+        """Порядковый номер преобразования для отсчета номер i в ring (0 - самый старый, -1 - самый новый)"""
+        n = len(self.ring)
+        if i < 0:
+            i += n
+        return self.seq - n + i
+
+    def run(self, count: int, callback=None):
+        """Выполняет count шагов step (бесконечно, если count равен нулю).
+        Если callback не None, для каждого нового отсчета, оставшегося в ring, вызывает callback(raw, ticks_us, seq)."""
+        ring = self.ring
+        i = 0
+        while 0 == count or i < count:
+            n = self.step()
+            if callback is not None:
+                if n > len(ring):
+                    n = len(ring)
+                for k in range(-n, 0):
+                    callback(ring.get_raw(k), ring.get_ticks(k), self.get_seq(k))
+            i += 1
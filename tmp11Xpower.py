@@ -0,0 +1,144 @@
+# micropython
+# MIT license
+"""Регистратор температуры с минимальным энергопотреблением: однократные измерения и сон MCU.
+
+Цикл одного пробуждения:
+    - одна запись в регистр конфигурации запускает однократное преобразование (MOD=11, см. tmp11Xoneshot);
+    - MCU спит (machine.lightsleep) время преобразования с небольшим запасом (OneShotScheduler.wait_ms),
+      после чего датчик сам переходит в Shutdown;
+    - одно чтение регистра TEMP; отсчет добавляется в пакет, хранящийся в памяти RTC;
+    - MCU спит до следующего измерения: machine.lightsleep или machine.deepsleep.
+После глубокого сна (deepsleep) программа запускается заново. Состояние (слово конфигурации, номер отсчета,
+накопленный пакет отсчетов) хранится в памяти RTC, поэтому при пробуждении драйвер создается с сохраненной
+конфигурацией (TMP11X(..., config=...)) без записи настроек по умолчанию и без проверок:
+на все пробуждение приходится две транзакции шины. Заполненный пакет передается функции on_batch
+(например, для записи в журнал tmp11Xlog), поэтому флэш-память записывается редко и крупными порциями.
+
+Пример (main.py, перезапускается после каждого глубокого сна):
+    def save(raw: memoryview, first_index: int):
+        ...     # запись raw во флэш-память
+
+    logger = LowPowerLogger(I2cAdapter(i2c), average=1, period_ms=60_000, on_batch=save)
+    logger.run(deep=True)
+"""
+
+import struct
+import time
+import machine
+from array import array
+from tmp11Xtimod import TMP11X
+from tmp11Xoneshot import OneShotScheduler
+
+_MAGIC = b"TP"
+_VERSION = 1
+# формат заголовка состояния в памяти RTC: magic, version, average, address, period_ms, config, index, pending
+_STATE_FMT = "<2sBBBIHIH"
+_STATE_SIZE = struct.calcsize(_STATE_FMT)
+
+
+class LowPowerLogger:
+    """Периодические однократные измерения со сном MCU между ними и сохранением состояния в памяти RTC"""
+
+    def __init__(self, adapter, address: int = 0x48, average: int = 1, period_ms: int = 60_000,
+                 batch: int = 32, on_batch=None, rtc=None):
+        """adapter - адаптер шины; address - адрес датчика;
+        average - режим усреднения AVG (0..3), определяет время преобразования (15.5, 125, 500, 1000 мс);
+        period_ms - период измерений, мс;
+        batch - количество отсчетов в пакете (2 байта на отсчет в памяти RTC);
+        on_batch - функция f(raw: memoryview, first_index: int), вызываемая при заполнении пакета, или None;
+        rtc - объект с методом memory() (по умолчанию machine.RTC())."""
+        if batch < 1:
+            raise ValueError(f"Неверное значение batch: {batch}")
+        self._rtc = machine.RTC() if rtc is None else rtc
+        self.period_ms = period_ms
+        self.on_batch = on_batch
+        self._average = average
+        self._address = address
+        self._pending = array("h", bytes(2 * batch))
+        # буфер состояния для памяти RTC, выделяется один раз
+        self._state = bytearray(_STATE_SIZE + 2 * batch)
+        # номер следующего отсчета и количество отсчетов в пакете
+        self.index = 0
+        self._n = 0
+        # Истина, если состояние восстановлено из памяти RTC (теплый старт)
+        self.warm = self._restore()
+        if self.warm:
+            sensor = TMP11X(adapter, address, config=self._config)
+        else:
+            sensor = TMP11X(adapter, address)
+        self.sensor = sensor
+        self._sched = OneShotScheduler(sensor, average, period_ms)
+        # после пробуждения драйвер создается с конфигурацией, которую датчик получил последней записью
+        self._config = self._sched.trigger_word
+
+    def _restore(self) -> bool:
+        """Восстанавливает состояние из памяти RTC. Возвращает Ложь, если состояния нет или оно не подходит"""
+        mem = self._rtc.memory()
+        if len(mem) != len(self._state):
+            return False
+        magic, version, average, address, period_ms, config, index, n = struct.unpack_from(_STATE_FMT, mem, 0)
+        if (_MAGIC != magic or _VERSION != version or average != self._average or address != self._address
+                or period_ms != self.period_ms or n > len(self._pending)):
+            return False
+        self._config = config
+        self.index = index
+        self._n = n
+        pending = self._pending
+        for i in range(n):
+            pending[i] = struct.unpack_from("<h", mem, _STATE_SIZE + 2 * i)[0]
+        return True
+
+    def _save(self):
+        """Сохраняет состояние в память RTC"""
+        state = self._state
+        struct.pack_into(_STATE_FMT, state, 0, _MAGIC, _VERSION, self._average, self._address, self.period_ms,
+                         self._config, self.index, self._n)
+        pending = self._pending
+        for i in range(self._n):
+            struct.pack_into("<h", state, _STATE_SIZE + 2 * i, pending[i])
+        self._rtc.memory(state)
+
+    def invalidate(self):
+        """Стирает состояние в памяти RTC: следующий запуск будет холодным (с настройкой датчика)"""
+        self._rtc.memory(b"")
+
+    def flush(self):
+        """Передает накопленные отсчеты функции on_batch, даже если пакет заполнен не полностью"""
+        n = self._n
+        if 0 == n:
+            return
+        if self.on_batch is not None:
+            self.on_batch(memoryview(self._pending)[:n], self.index - n)
+        self._n = 0
+
+    def step(self) -> int:
+        """Одно измерение: запуск преобразования, сон MCU на время преобразования (с запасом), чтение результата.
+        Возвращает raw-значение (1 LSB = 7.8125 m°C)."""
+        sched = self._sched
+        sched.trigger()
+        machine.lightsleep(sched.wait_ms)
+        raw = self.sensor.get_measurement_raw()
+        self._pending[self._n] = raw
+        self._n += 1
+        self.index += 1
+        if self._n == len(self._pending):
+            self.flush()
+        self._save()
+        return raw
+
+    def run(self, deep: bool = False, count: int = 0):
+        """Выполняет измерения с периодом period_ms, MCU спит между ними.
+        deep - глубокий сон: после пробуждения программа начинается заново (состояние в памяти RTC),
+        поэтому метод не возвращает управление. Иначе выполняется count измерений (бесконечно, если ноль)."""
+        i = 0
+        while 0 == count or i < count:
+            start = time.ticks_ms()
+            self.step()
+            i += 1
+            wait = self.period_ms - time.ticks_diff(time.ticks_ms(), start)
+            if wait < 1:
+                wait = 1
+            if deep:
+                machine.deepsleep(wait)
+            else:
+                machine.lightsleep(wait)
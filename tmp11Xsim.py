@@ -0,0 +1,420 @@
+# micropython
+# MIT license
+"""Программная модель датчиков TMP117/TMP119 на шине I2C.
+
+Модуль позволяет запускать драйвер tmp11Xtimod.TMP11X без реального датчика: на плате с MicroPython
+или на компьютере (CI, профилирование). SimI2C повторяет методы machine.I2C, которыми пользуется
+I2cAdapter (readfrom_mem_into, readfrom_mem, writeto_mem, readfrom, readfrom_into, writeto, scan),
+и передает обращения моделям датчиков TMP11XSim по их адресам на шине.
+
+Модель учитывает:
+    - карту регистров (TEMP, CONFIG, THIGH/TLOW, EEPROM_UL, EEPROM1-3, OFFSET, DEVICE_ID);
+    - время преобразования (CONV[2:0], AVG[1:0]), режимы CC/SD/OS;
+    - сброс флага Data_Ready при чтении TEMP или CONFIG;
+    - флаги High/Low Alert в режимах Therm и Alert (сброс чтением CONFIG в режиме Alert);
+    - состояние вывода ALERT (DR/Alert, POL), программный сброс и программирование EEPROM (~7 мс).
+
+Время модели по умолчанию виртуальное (детерминированное): оно увеличивается на расчетное время каждой
+транзакции на шине и вызовом SimI2C.sleep_ms/sleep_us. Модуль не зависит от machine и micropython.
+На компьютере (CPython) при импорте модуля вызывается tmp11Xhost.install(): драйвер и модули tmp11X*
+импортируются без MicroPython. tmp11Xhost.use_clock(bus) переводит time.sleep_ms/ticks_* драйвера
+на виртуальное время bus.
+
+Пример:
+    bus = SimI2C(freq=400_000)
+    sim = bus.add_device(TMP11XSim(address=0x48, temperature=25.0))
+    sensor = TMP11X(I2cAdapter(bus))
+    bus.sleep_ms(sensor.get_conversion_cycle_time())
+    print(sensor.get_measurement_value(), bus.transactions, bus.bus_time_us)
+"""
+
+import sys
+import time
+
+if "micropython" != sys.implementation.name:
+    import tmp11Xhost
+    tmp11Xhost.install()
+
+# Адреса регистров (совпадают с tmp11Xtimod.py)
+REG_TEMP = 0x00
+REG_CONFIG = 0x01
+REG_THIGH = 0x02
+REG_TLOW = 0x03
+REG_EEPROM_UL = 0x04
+REG_EEPROM1 = 0x05
+REG_EEPROM2 = 0x06
+REG_OFFSET = 0x07
+REG_EEPROM3 = 0x08
+REG_DEVICE_ID = 0x0F
+
+# Базовое время цикла преобразования для CONV[2:0] (в мс), как _CONV_BASE_TIME_MS в tmp11Xtimod.py
+CONV_BASE_TIME_MS = (16, 125, 250, 500, 1000, 4000, 8000, 16000)
+# Минимальное время цикла для AVG[1:0] (в мс), как _AVG_MIN_CYCLE_MS в tmp11Xtimod.py
+AVG_MIN_CYCLE_MS = (0, 125, 500, 1000)
+# Активное время преобразования для AVG[1:0] (в мкс). 15.5 мс на одно преобразование без усреднения
+AVG_ACTIVE_TIME_US = (15_500, 125_000, 500_000, 1_000_000)
+# Время программирования EEPROM и загрузки EEPROM после сброса (в мкс)
+EEPROM_PROGRAM_TIME_US = 7_000
+EEPROM_LOAD_TIME_US = 1_500
+
+# Значения регистров после включения питания (заводское содержимое EEPROM)
+DEFAULT_CONFIG = 0x0220     # CC, CONV=4 (1 с), AVG=1 (8 усреднений)
+DEFAULT_THIGH = 0x6000      # 192 °C
+DEFAULT_TLOW = 0x8000       # -256 °C
+# Биты CONFIG, доступные для записи хостом (AVG, CONV, MOD, T/nA, POL, DR/Alert)
+CONFIG_WRITE_MASK = 0x0FFC
+# Значение регистра TEMP до первого преобразования (-256 °C)
+TEMP_NOT_READY = 0x8000
+# регистры, значения которых хранятся в EEPROM
+_EEPROM_BACKED = (REG_CONFIG, REG_THIGH, REG_TLOW, REG_EEPROM1, REG_EEPROM2, REG_OFFSET, REG_EEPROM3)
+
+
+def _now_us() -> int:
+    """Реальное время в мкс (MicroPython или CPython)"""
+    try:
+        return time.ticks_us()
+    except AttributeError:
+        return time.perf_counter_ns() // 1000
+
+
+def celsius_to_raw(temp_celsius: float) -> int:
+    """Преобразует °C в raw-значение регистра (16 бит, дополнительный код) с насыщением."""
+    raw = int(round(128 * temp_celsius))
+    if raw > 32767:
+        raw = 32767
+    if raw < -32767:
+        raw = -32767
+    return raw & 0xFFFF
+
+
+def _to_signed(value: int) -> int:
+    return value - 0x10000 if value & 0x8000 else value
+
+
+class TMP11XSim:
+    """Модель одного датчика TMP117/TMP119.
+
+    temperature - температура среды в °C (float) или функция f(t_s: float) -> float,
+    где t_s - время модели в секундах. Поле можно менять во время работы модели.
+    model - 117 или 119 (влияет на поле revision number регистра DEVICE_ID)."""
+
+    def __init__(self, address: int = 0x48, temperature=25.0, model: int = 117, uid: tuple = (0x1234, 0, 0)):
+        self.address = address
+        self.temperature = temperature
+        self.device_id = 0x2117 if 119 == model else 0x0117
+        # содержимое EEPROM
+        self.eeprom = {REG_CONFIG: DEFAULT_CONFIG, REG_THIGH: DEFAULT_THIGH, REG_TLOW: DEFAULT_TLOW,
+                       REG_EEPROM1: uid[0], REG_EEPROM2: uid[1], REG_EEPROM3: uid[2], REG_OFFSET: 0}
+        # кол-во циклов программирования EEPROM (износ)
+        self.eeprom_writes = 0
+        # кол-во завершенных преобразований
+        self.conversions = 0
+        # функция f(sim), вызываемая при переходе вывода ALERT в активное состояние (имитация IRQ)
+        self.alert_callback = None
+        self.regs = {}
+        # указатель регистра (для транзакций writeto/readfrom_into)
+        self.pointer = REG_TEMP
+        self._bus = None
+        self._eun = False
+        self._busy_until = 0
+        self._data_ready = self._low_alert = self._high_alert = False
+        self._next_conv = None
+        self._alert_pin = False
+        self._load_eeprom(0)
+
+    def attach(self, bus):
+        """Вызывается шиной при добавлении модели"""
+        self._bus = bus
+        self._load_eeprom(bus.now_us())
+
+    def _load_eeprom(self, now: int):
+        """Загрузка регистров из EEPROM (включение питания, программный сброс)"""
+        for reg, val in self.eeprom.items():
+            self.regs[reg] = val
+        self.regs[REG_TEMP] = TEMP_NOT_READY
+        self._eun = False
+        self._data_ready = self._low_alert = self._high_alert = False
+        self._busy_until = now + EEPROM_LOAD_TIME_US
+        self._restart(now)
+        self._update_alert_pin()
+
+    # ---------------------------------------------------------------------
+    # Поля конфигурации
+    # ---------------------------------------------------------------------
+    @property
+    def mode(self) -> int:
+        return (self.regs[REG_CONFIG] >> 10) & 0b11
+
+    @property
+    def conv(self) -> int:
+        return (self.regs[REG_CONFIG] >> 7) & 0b111
+
+    @property
+    def avg(self) -> int:
+        return (self.regs[REG_CONFIG] >> 5) & 0b11
+
+    @property
+    def therm_mode(self) -> bool:
+        return bool(self.regs[REG_CONFIG] & 0x10)
+
+    @property
+    def alert_pin(self) -> bool:
+        """Электрический уровень вывода ALERT с учетом POL (True - высокий)"""
+        return self._alert_pin
+
+    def cycle_time_us(self) -> int:
+        """Период преобразований в режиме CC (в мкс)"""
+        base = CONV_BASE_TIME_MS[self.conv]
+        min_required = AVG_MIN_CYCLE_MS[self.avg]
+        return 1000 * (base if base > min_required else min_required)
+
+    def _restart(self, now: int):
+        """Перезапуск цикла преобразований после записи CONFIG"""
+        mode = self.mode
+        if 1 == mode:
+            self._next_conv = None
+        else:
+            self._next_conv = now + AVG_ACTIVE_TIME_US[self.avg]
+
+    def _temperature_at(self, t_us: int) -> float:
+        t = self.temperature
+        if callable(t):
+            return t(t_us / 1_000_000)
+        return t
+
+    # ---------------------------------------------------------------------
+    # Модель преобразований
+    # ---------------------------------------------------------------------
+    def update(self, now: int):
+        """Обрабатывает все преобразования, завершившиеся к моменту времени now (мкс)"""
+        nxt = self._next_conv
+        if nxt is None or now < nxt:
+            return
+        if 3 == self.mode:
+            # One-shot: одно преобразование, затем shutdown
+            self._next_conv = None
+            self._convert(nxt)
+            return
+        period = self.cycle_time_us()
+        n = 1 + (now - nxt) // period
+        last = nxt + (n - 1) * period
+        self.conversions += n - 1
+        # время следующего преобразования изменяется до _convert: alert_callback может обратиться к модели
+        self._next_conv = last + period
+        self._convert(last)
+
+    def _convert(self, t_us: int):
+        raw = celsius_to_raw(self._temperature_at(t_us))
+        raw = (_to_signed(raw) + _to_signed(self.regs[REG_OFFSET])) & 0xFFFF
+        self.regs[REG_TEMP] = raw
+        self.conversions += 1
+        self._data_ready = True
+        t = _to_signed(raw)
+        t_high = _to_signed(self.regs[REG_THIGH])
+        t_low = _to_signed(self.regs[REG_TLOW])
+        if self.therm_mode:
+            # Therm: HIGH_Alert устанавливается при T > THIGH и сбрасывается при T < TLOW (гистерезис)
+            if t > t_high:
+                self._high_alert = True
+            elif t < t_low:
+                self._high_alert = False
+        else:
+            # Alert: флаги защелкиваются до чтения CONFIG
+            if t > t_high:
+                self._high_alert = True
+            if t < t_low:
+                self._low_alert = True
+        self._update_alert_pin()
+
+    def _update_alert_pin(self):
+        cfg = self.regs[REG_CONFIG]
+        if cfg & 0x04:      # DR/Alert: вывод ALERT отражает Data_Ready
+            active = self._data_ready
+        elif self.therm_mode:
+            active = self._high_alert
+        else:
+            active = self._high_alert or self._low_alert
+        pol = bool(cfg & 0x08)
+        level = active if pol else not active
+        was_active = self._alert_pin == pol
+        self._alert_pin = level
+        if active and not was_active and self.alert_callback is not None:
+            self.alert_callback(self)
+
+    # ---------------------------------------------------------------------
+    # Доступ к регистрам
+    # ---------------------------------------------------------------------
+    def read_reg(self, reg: int, now: int) -> int:
+        """Чтение регистра хостом, с побочными эффектами"""
+        self.update(now)
+        if REG_CONFIG == reg:
+            val = self.regs[REG_CONFIG] & CONFIG_WRITE_MASK
+            val |= self._high_alert << 15 | self._low_alert << 14 | self._data_ready << 13
+            val |= (now < self._busy_until) << 12
+            self._data_ready = False
+            if not self.therm_mode:
+                self._high_alert = self._low_alert = False
+            self._update_alert_pin()
+            return val
+        if REG_TEMP == reg:
+            self._data_ready = False
+            self._update_alert_pin()
+            return self.regs[REG_TEMP]
+        if REG_EEPROM_UL == reg:
+            return self._eun << 15 | (now < self._busy_until) << 14
+        if REG_DEVICE_ID == reg:
+            return self.device_id
+        return self.regs.get(reg, 0)
+
+    def write_reg(self, reg: int, value: int, now: int):
+        """Запись регистра хостом, с побочными эффектами"""
+        self.update(now)
+        value &= 0xFFFF
+        if REG_EEPROM_UL == reg:
+            self._eun = bool(value & 0x8000)
+            return
+        if reg not in _EEPROM_BACKED:
+            return      # TEMP, DEVICE_ID - только чтение
+        if REG_CONFIG == reg:
+            if value & 0x02:
+                # Soft_Reset
+                self._load_eeprom(now)
+                return
+            value &= CONFIG_WRITE_MASK
+        if reg in (REG_EEPROM1, REG_EEPROM2, REG_EEPROM3) and not self._eun:
+            return      # регистры общего назначения записываются только через EEPROM
+        self.regs[reg] = value
+        if self._eun and now >= self._busy_until:
+            self.eeprom[reg] = value
+            self.eeprom_writes += 1
+            self._busy_until = now + EEPROM_PROGRAM_TIME_US
+        if REG_CONFIG == reg:
+            self._restart(now)
+        self._update_alert_pin()
+
+
+class SimI2C:
+    """Заменитель machine.I2C для моделей TMP11XSim.
+
+    freq - частота шины в Гц, используется для расчета времени транзакций;
+    realtime - если Истина, время модели берется из реальных часов (time.ticks_us/perf_counter),
+    иначе время виртуальное и увеличивается на время каждой транзакции и вызовами sleep_ms/sleep_us.
+
+    Счетчики: transactions (START..STOP), reads, writes, bytes_transferred, bus_time_us,
+    reg_reads/reg_writes - словари адрес регистра -> кол-во обращений."""
+
+    def __init__(self, freq: int = 400_000, realtime: bool = False):
+        self.freq = freq
+        self.realtime = realtime
+        self._devices = {}
+        self._virtual_us = 0
+        self._t0 = _now_us()
+        self.reset_counters()
+
+    def reset_counters(self):
+        """Обнуляет счетчики транзакций"""
+        self.transactions = self.reads = self.writes = 0
+        self.bytes_transferred = 0
+        self.bus_time_us = 0
+        self.reg_reads = {}
+        self.reg_writes = {}
+
+    def add_device(self, device: TMP11XSim) -> TMP11XSim:
+        """Подключает модель датчика к шине. Возвращает device"""
+        self._devices[device.address] = device
+        device.attach(self)
+        return device
+
+    def now_us(self) -> int:
+        """Текущее время модели в мкс"""
+        if self.realtime:
+            return _now_us() - self._t0
+        return self._virtual_us
+
+    def sleep_us(self, us: int):
+        """Аналог time.sleep_us для виртуального времени.
+        После паузы модели датчиков обрабатывают завершившиеся преобразования (и могут вызвать alert_callback)."""
+        if self.realtime:
+            time.sleep(us / 1_000_000)
+        else:
+            self._virtual_us += us
+        now = self.now_us()
+        for dev in self._devices.values():
+            dev.update(now)
+
+    def sleep_ms(self, ms: int):
+        """Аналог time.sleep_ms для виртуального времени"""
+        self.sleep_us(1000 * ms)
+
+    def scan(self) -> list:
+        return sorted(self._devices)
+
+    def _device(self, addr: int) -> TMP11XSim:
+        dev = self._devices.get(addr)
+        if dev is None:
+            raise OSError(19)   # ENODEV, как в MicroPython
+        return dev
+
+    def _transfer(self, n_bytes: int, restart: bool = False):
+        """Учет транзакции: n_bytes байт (включая байт адреса), 9 тактов на байт плюс START/STOP"""
+        self.transactions += 1
+        self.bytes_transferred += n_bytes
+        bits = 9 * n_bytes + (4 if restart else 2)
+        us = (1_000_000 * bits + self.freq - 1) // self.freq
+        self.bus_time_us += us
+        if not self.realtime:
+            self._virtual_us += us
+
+    def _read_mem(self, addr: int, memaddr: int, buf):
+        dev = self._device(addr)
+        self._transfer(3 + len(buf), restart=True)
+        self.reads += 1
+        self.reg_reads[memaddr] = self.reg_reads.get(memaddr, 0) + 1
+        # указатель регистра не инкрементируется: каждые два байта - одно и то же значение
+        val = dev.read_reg(memaddr, self.now_us())
+        for i in range(len(buf)):
+            buf[i] = (val >> 8) if 0 == i % 2 else (val & 0xFF)
+
+    def readfrom_mem_into(self, addr: int, memaddr: int, buf, addrsize: int = 8):
+        self._read_mem(addr, memaddr, buf)
+
+    def readfrom_mem(self, addr: int, memaddr: int, nbytes: int, addrsize: int = 8) -> bytes:
+        buf = bytearray(nbytes)
+        self._read_mem(addr, memaddr, buf)
+        return bytes(buf)
+
+    def writeto_mem(self, addr: int, memaddr: int, buf, addrsize: int = 8):
+        dev = self._device(addr)
+        self._transfer(2 + len(buf))
+        self.writes += 1
+        self.reg_writes[memaddr] = self.reg_writes.get(memaddr, 0) + 1
+        if len(buf) >= 2:
+            dev.write_reg(memaddr, (buf[0] << 8) | buf[1], self.now_us())
+
+    def writeto(self, addr: int, buf, stop: bool = True) -> int:
+        """Запись указателя регистра (1 байт) или указателя и значения (3 байта)"""
+        dev = self._device(addr)
+        self._transfer(1 + len(buf))
+        self.writes += 1
+        if len(buf) >= 1:
+            dev.pointer = buf[0]
+        if len(buf) >= 3:
+            self.reg_writes[buf[0]] = self.reg_writes.get(buf[0], 0) + 1
+            dev.write_reg(buf[0], (buf[1] << 8) | buf[2], self.now_us())
+        return len(buf)
+
+    def readfrom_into(self, addr: int, buf, stop: bool = True):
+        """Чтение по ранее записанному указателю регистра"""
+        dev = self._device(addr)
+        self._transfer(1 + len(buf))
+        self.reads += 1
+        reg = dev.pointer
+        self.reg_reads[reg] = self.reg_reads.get(reg, 0) + 1
+        val = dev.read_reg(reg, self.now_us())
+        for i in range(len(buf)):
+            buf[i] = (val >> 8) if 0 == i % 2 else (val & 0xFF)
+
+    def readfrom(self, addr: int, nbytes: int, stop: bool = True) -> bytes:
+        buf = bytearray(nbytes)
+        self.readfrom_into(addr, buf, stop)
+        return bytes(buf)
@@ -1,16 +1,19 @@
 # micropython
 # MIT license
 
+import time
 import micropython
+from array import array
 from micropython import const
 from collections import namedtuple
 from sensor_pack_2 import bus_service
-from sensor_pack_2.base_sensor import DeviceEx, IBaseSensorEx, IDentifier, Iterator, check_value_ex, check_value
+from sensor_pack_2.base_sensor import DeviceEx, IBaseSensorEx, IDentifier, Iterator, check_value_ex, check_range
 from sensor_pack_2.comp_interface import ICompInterface, CompMode
 
 flags_tmp11X = namedtuple("flags_tmp11X", "eeprom_busy data_ready low_alert high_alert")
 id_tmp11X = namedtuple("id_tmp11X", "revision_number device_id")
 uid_tmp11X = namedtuple("uid_tmp11X", "word_0 word_1 word_2")
+snapshot_tmp11X = namedtuple("snapshot_tmp11X", "temperature config t_high t_low eeprom_ul eeprom_1 eeprom_2 offset eeprom_3 device_id")
 
 # Please read this before use!: https://www.ti.com/product/TMP117
 # About NIST:   https://e2e.ti.com/support/sensors-group/sensors/f/sensors-forum/1000579/tmp117-tmp117-nist-byte-order-and-eeprom4-address
@@ -44,6 +47,13 @@ _CONV_BASE_TIME_MS: tuple[int, ...] = const((16, 125, 250, 500, 1000, 4000, 8000
 # Если время усреднения больше базового CONV, цикл удлиняется (standby = 0)
 # Индексы: b00 b01 b10 b11
 _AVG_MIN_CYCLE_MS: tuple[int, ...] = const((0, 125, 500, 1000))
+# Время однократного преобразования (One-shot) без усреднения, мс (15.5 мс по дата шиту, с округлением вверх)
+_OS_MIN_TIME_MS: int = const(16)
+# Допустимые значения настроек. Создаются один раз, а не при каждой проверке!
+_CONV_RANGE = range(8)
+_AVG_RANGE = range(4)
+_MODE_RANGE = range(4)
+_COMP_MODE_RANGE = range(2)
 # коэффициент для расчета температуры
 _scale = const(7.8125E-3)
 _scale_inv = const(128)
@@ -52,7 +62,55 @@ _UID_EEPROM_ADDR: tuple[int, ...] = const((_REG_EEPROM1, _REG_EEPROM2, _REG_EEPR
 # рабочий диапазон порогов температуры для датчиков из полупроводников на основе кремния
 _THRESHOLD_TEMP_MIN: int = const(-40)   # для Industrial/Extended/Automotive исполнений датчиков
 _THRESHOLD_TEMP_MAX: int = const(125)   # для Extended/Automotive исполнений датчиков
+# Регистры снимка состояния датчика (get_snapshot), в порядке полей snapshot_tmp11X
+_SNAPSHOT_REGS: tuple[int, ...] = const((_REG_TEMP, _REG_CONFIG, _REG_THIGH, _REG_TLOW, _REG_EEPROM_UL,
+                                         _REG_EEPROM1, _REG_EEPROM2, _REG_OFFSET, _REG_EEPROM3, _REG_DEVICE_ID))
+# Регистры порогов (Tmin, T_max)
+_THRESHOLD_REGS: tuple[int, ...] = const((_REG_TLOW, _REG_THIGH))
 _hex_FFFF = const(0xFFFF)
+# Маски флагов состояния в регистре конфигурации
+_EEPROM_BUSY_MASK: int = const(0x1000)     # бит 12
+_DATA_READY_MASK: int = const(0x2000)      # бит 13
+_LOW_ALERT_MASK: int = const(0x4000)       # бит 14
+_HIGH_ALERT_MASK: int = const(0x8000)      # бит 15
+# Биты регистра конфигурации, которыми управляет хост (AVG, CONV, MOD, T/nA, POL, DR/Alert).
+# Остальные биты (HIGH_Alert, LOW_Alert, Data_Ready, EEPROM_Busy) изменяются датчиком!
+_CONFIG_HOST_MASK = const(0x0FFC)
+# Регистры, значения которых при включении питания загружаются из EEPROM, в порядке get_eeprom_changes
+_EEPROM_CONFIG_REGS: tuple[int, ...] = const((_REG_CONFIG, _REG_THIGH, _REG_TLOW, _REG_OFFSET))
+# бит EUN регистра EEPROM_UL: запись в регистры программирует EEPROM
+_EEPROM_UNLOCK: int = const(0x8000)
+# время программирования ячейки EEPROM, мс (раздел 7.5.1.2 дата шита)
+_EEPROM_PROG_TIME_MS: int = const(7)
+# время загрузки настроек из EEPROM после программного сброса, мс
+_SOFT_RESET_TIME_MS: int = const(2)
+
+@micropython.viper
+def _test_bit(word: int, mask: int) -> bool:
+    """Возвращает Истина, если в word установлен хотя бы один бит из mask"""
+    return (word & mask) != 0
+
+@micropython.native
+def _to_signed16(value: int) -> int:
+    """Беззнаковое 16-ти битное значение в знаковое"""
+    return value - 0x10000 if value & 0x8000 else value
+
+def get_conversion_time_ms(conversion_mode: int, conversion_cycle_time: int, average: int) -> int:
+    """Возвращает время преобразования температуры датчиком в мс для заданных значений полей MOD, CONV и AVG
+    регистра конфигурации. Значения проверяются."""
+    check_range(conversion_mode, _MODE_RANGE, "conversion_mode")
+    conv = check_range(conversion_cycle_time, _CONV_RANGE, "conversion_cycle_time")
+    avg = check_range(average, _AVG_RANGE, "average")
+    # минимально необходимое время для выбранного усреднения AVG
+    min_required_time = _AVG_MIN_CYCLE_MS[avg]
+    # В One-Shot режиме CONV игнорируется (раздел 7.4.3)
+    if 3 == conversion_mode:  # One-shot
+        return min_required_time if min_required_time > _OS_MIN_TIME_MS else _OS_MIN_TIME_MS
+    # запланированное время цикла из настроек CONV
+    base_time = _CONV_BASE_TIME_MS[conv]
+    # Реальное время = максимум из двух (общее время цикла не может быть меньше времени,
+    # которое физически требуется датчику на выполнение всех измерений для усреднения.)
+    return base_time if base_time > min_required_time else min_required_time
 
 @micropython.native
 def _celsius_to_raw(temp_celsius: float) -> int:
@@ -65,6 +123,34 @@ def _raw_to_celsius(value: int) -> float:
     # Масштабирование: temp = raw / 128
     return _scale * value
 
+@micropython.native
+def raw_to_millicelsius(raw: int) -> int:
+    """Преобразует raw-значение (1 LSB = 7.8125 m°C) в целые милли-градусы Цельсия, без float"""
+    return (raw * 125 + 8) >> 4
+
+@micropython.native
+def millicelsius_to_raw(value: int) -> int:
+    """Преобразует милли-градусы Цельсия в raw-значение (знаковое, с округлением к ближайшему), без float"""
+    return (value * 32 + 125) // 250
+
+class TMP11XFlags:
+    """Изменяемый набор флагов состояния датчика. Создайте один экземпляр заранее и передавайте его
+    в TMP11X.read_status: флаги обновляются на месте, память не выделяется (в отличие от get_flags)."""
+
+    def __init__(self):
+        self.raw = 0
+        self.eeprom_busy = self.data_ready = self.low_alert = self.high_alert = False
+
+    @micropython.native
+    def update(self, raw: int):
+        """Обновляет флаги по значению регистра конфигурации raw"""
+        self.raw = raw
+        self.eeprom_busy = _test_bit(raw, _EEPROM_BUSY_MASK)
+        self.data_ready = _test_bit(raw, _DATA_READY_MASK)
+        self.low_alert = _test_bit(raw, _LOW_ALERT_MASK)
+        self.high_alert = _test_bit(raw, _HIGH_ALERT_MASK)
+
+
 class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
     """
     Драйвер для семейства температурных датчиков TI TMP11X.
@@ -77,9 +163,39 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
     """
     # точность измерения температуры датчиком
     TYPICAL_ACCURACY: float = const(0.1)
-
-    def __init__(self, adapter: bus_service.BusAdapter, address: int = 0x48):
-        """conversion_mode:
+    # цена младшего разряда регистра температуры, °C. Для преобразования raw-значений (SampleRing.scale и т.п.)
+    RESOLUTION: float = const(7.8125E-3)
+    # допустимый диапазон порогов компаратора в raw-единицах (от -40 до 125 °C), см. set_thresholds_raw
+    THRESHOLD_RAW_MIN: int = const(-5120)
+    THRESHOLD_RAW_MAX: int = const(16000)
+    # наименьшее окно порогов (T_max - Tmin) в raw-единицах: 3 x TYPICAL_ACCURACY = 38.4 LSB, с округлением вверх
+    THRESHOLD_RAW_WINDOW_MIN: int = const(39)
+    # Формат результата get_measurement_value (поле output_format)
+    OUT_CELSIUS: int = const(0)         # float, °C
+    OUT_MILLICELSIUS: int = const(1)    # int, m°C
+    OUT_RAW: int = const(2)             # int, raw-значение регистра (1 LSB = 7.8125 m°C)
+
+    def __init__(self, adapter: bus_service.BusAdapter, address: int = 0x48, cache_config: bool = False,
+                 config: int | None = None, adopt: bool = False):
+        """Способы запуска (по умолчанию в датчик записываются настройки по умолчанию: непрерывный режим,
+        цикл 1 с, 8 усреднений; запись прерывает текущее преобразование):
+
+        config: если не None, то значение регистра конфигурации, сохраненное ранее (например, в памяти RTC
+        перед глубоким сном, см. tmp11Xpower). Поля экземпляра и теневая копия заполняются из него,
+        обращения к шине при создании экземпляра нет.
+
+        adopt: если Истина, то текущая конфигурация датчика (загруженная из EEPROM при включении питания
+        или установленная до перезапуска MCU, например по сторожевому таймеру) принимается как есть:
+        одно чтение регистра конфигурации, без записи. Преобразования датчика не прерываются.
+        Флаги состояния, сброшенные этим чтением, сохраняются в полях data_ready, low_alert, high_alert.
+
+        cache_config: если Истина, то драйвер хранит теневую копию (shadow) битов конфигурации,
+        которыми управляет хост (AVG, CONV, MOD, T/nA, POL, DR/Alert). Копия обновляется при каждой записи
+        (write-through) и чтении конфигурации. Запросы режима (is_single_shot_mode, is_continuously_mode,
+        set_comp_mode) тогда не обращаются к шине, а is_over_threshold читает только биты состояния.
+        Не включайте, если конфигурацию датчика изменяет кто-то еще (другой хост на шине)!
+
+        conversion_mode:
             00: Continuous conversion (CC)
             01: Shutdown (SD)
             10: Continuous conversion (CC), Same as 00
@@ -95,29 +211,69 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
             10: 32 averaged conversions
             11: 64 averaged conversions
             """
+        if config is not None and adopt:
+            raise ValueError("Параметры config и adopt несовместимы!")
         self._connection = DeviceEx(adapter=adapter, address=address, big_byte_order=True)
         self._buf_2 = bytearray(2)      # для _read_from_into
+        self._buf_2w = bytearray(2)     # для записи регистров без выделения памяти
+        # результаты пакетного чтения регистров (read_registers)
+        self._regs_out = array("H", bytes(2 * len(_SNAPSHOT_REGS)))
         self.conversion_mode = 2
         self.conversion_cycle_time = 4
         self.average = 1
         self.DR_Alert = self.POL = self.T_nA = False
         self.data_ready = self.low_alert = self.high_alert = False
+        # теневая копия битов конфигурации хоста или None, если копия недействительна
+        self.cache_config = cache_config
+        self._cfg_shadow = None
+        # запомненное время преобразования и значения настроек, для которых оно вычислено
+        self._cct = 0
+        self._cct_mode = self._cct_conv = self._cct_avg = -1
+        # формат результата get_measurement_value. OUT_MILLICELSIUS и OUT_RAW - малые целые числа,
+        # которые не размещаются в куче (в отличие от float на многих портах MicroPython)
+        self.output_format = TMP11X.OUT_CELSIUS
         #
-        self.set_config()
+        if config is not None:
+            self._decode_config(config)
+        elif adopt:
+            self.get_config()
+        else:
+            self.set_config()
 
+    @micropython.native
     def get_set_reg(self, addr: int, format_value: str | None, value: int | None = None) -> int:
         """Возвращает (при value is None)/устанавливает (при not value is None) содержимое регистра с адресом addr.
-        разрядность регистра 16 бит!"""
-        buf = self._buf_2
-        _conn = self._connection
+        разрядность регистра 16 бит!
+        format_value: "h" - знаковое значение, "H" - беззнаковое.
+        Чтение декодируется прямо из self._buf_2, запись упаковывается в self._buf_2w. Память не выделяется!"""
         if value is None:
             # читаю из Register устройства в буфер два байта
             if format_value is None:
                 raise ValueError("При чтении из регистра не задан формат его значения!")
-            _conn.read_buf_from_mem(address=addr, buf=buf, address_size=1)
-            return _conn.unpack(fmt_char=format_value, source=buf)[0]
+            return self._connection.read_reg_16_into(addr, self._buf_2, "h" == format_value)
         #
-        return self._connection.write_reg(reg_addr=addr, value=value, bytes_count=len(buf))
+        return self._connection.write_reg_16_from(addr, value, self._buf_2w)
+
+    def read_registers(self, addrs, out=None):
+        """Пакетное чтение регистров с адресами addrs в заранее выделенный массив.
+        out - массив/список для беззнаковых 16-ти битных значений. Если None, используется внутренний массив
+        драйвера (не более 10 регистров), который перезаписывается при следующем вызове!
+        Датчик не увеличивает указатель регистра автоматически, поэтому каждый регистр читается
+        отдельной транзакцией, но без выделения памяти.
+        Возвращает out."""
+        if out is None:
+            out = self._regs_out
+        return self._connection.read_regs_16_into(addrs, self._buf_2, out)
+
+    def get_snapshot(self) -> snapshot_tmp11X:
+        """Возвращает снимок всех регистров датчика одним вызовом.
+        Значения температуры, порогов и смещения - знаковые raw-значения (1 LSB = 7.8125 m°C),
+        остальные - беззнаковые. Внимание: чтение CONFIG и TEMP сбрасывает флаг Data_Ready,
+        а в режиме Alert и флаги HIGH/LOW Alert!"""
+        r = self.read_registers(_SNAPSHOT_REGS)
+        return snapshot_tmp11X(temperature=_to_signed16(r[0]), config=r[1], t_high=_to_signed16(r[2]),
+                               t_low=_to_signed16(r[3]), eeprom_ul=r[4], eeprom_1=r[5], eeprom_2=r[6],
+                               offset=_to_signed16(r[7]), eeprom_3=r[8], device_id=r[9])
 
     @micropython.native
     def get_unlock_reg(self) -> int:
@@ -146,25 +302,144 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
         unlock_reg = self.get_unlock_reg()
         return bool(unlock_reg & 0x4000)  # Бит 14
 
+    def wait_eeprom_steps(self, timeout_ms: int = 50, first_ms: int = 0):
+        """Генератор пауз (мс) ожидания сброса флага EEPROM_Busy. first_ms - пауза до первого опроса (например,
+        время программирования), далее флаг опрашивается с удваивающимся интервалом 1, 2, 4, 8, 8... мс.
+        Если EEPROM занята дольше first_ms + timeout_ms мс, возбуждает RuntimeError.
+        Паузы выполняет вызывающий код: wait_eeprom (time.sleep_ms) или AsyncTMP11X (await asyncio.sleep_ms)."""
+        if first_ms:
+            yield first_ms
+        waited = 0
+        delay = 1
+        while self.is_eeprom_busy():
+            if waited >= timeout_ms:
+                raise RuntimeError(f"EEPROM занята дольше {timeout_ms} мс!")
+            yield delay
+            waited += delay
+            if delay < 8:
+                delay <<= 1
+
+    def wait_eeprom(self, timeout_ms: int = 50, first_ms: int = 0):
+        """Ожидает сброса флага EEPROM_Busy, см. wait_eeprom_steps"""
+        for ms in self.wait_eeprom_steps(timeout_ms, first_ms):
+            time.sleep_ms(ms)
+
+    def set_eeprom_unlock(self, unlock: bool):
+        """Устанавливает (unlock=True) или сбрасывает бит EUN регистра EEPROM_UL.
+        Пока бит установлен, каждая запись в регистр конфигурации, порогов или смещения программирует EEPROM!"""
+        self.get_set_reg(addr=_REG_EEPROM_UL, format_value=None, value=_EEPROM_UNLOCK if unlock else 0)
+
+    @staticmethod
+    def check_eeprom_values(config: int | None = None, thresholds: tuple[int, int] | None = None,
+                            offset: int | None = None):
+        """Проверяет значения для программирования EEPROM без обращения к шине, возбуждает ValueError.
+        config - только биты хоста (_CONFIG_HOST_MASK, см. get_config_word); thresholds - как в set_thresholds_raw;
+        offset - int16. Вызывается до разблокировки EEPROM: неверное значение не должно попасть в EEPROM!"""
+        if config is not None and config & ~_CONFIG_HOST_MASK:
+            raise ValueError(f"Слово конфигурации 0x{config:04X} содержит биты вне маски 0x{_CONFIG_HOST_MASK:04X}!")
+        if thresholds is not None:
+            TMP11X._check_thresholds_raw(thresholds)
+        if offset is not None and not -0x8000 <= offset <= 0x7FFF:
+            raise ValueError(f"Смещение {offset} вне диапазона int16!")
+
+    @staticmethod
+    def _check_thresholds_raw(thresholds: tuple[int, int]):
+        """Проверяет пороги (Tmin, T_max) в raw-единицах: допустимый диапазон и наименьшее окно"""
+        t_min, t_max = thresholds
+        lo = TMP11X.THRESHOLD_RAW_MIN
+        hi = TMP11X.THRESHOLD_RAW_MAX
+        if not lo <= t_min <= hi or not lo <= t_max <= hi:
+            raise ValueError(f"Пороги {thresholds} вне диапазона: {(lo, hi)}")
+        if t_max - t_min < TMP11X.THRESHOLD_RAW_WINDOW_MIN:
+            raise ValueError(f"Окно температур ({t_max - t_min} LSB) слишком узкое! Увеличьте разницу между T_min и T_max!")
+
+    def get_eeprom_changes(self, config: int | None = None, thresholds: tuple[int, int] | None = None,
+                           offset: int | None = None) -> tuple:
+        """Сравнивает желаемые значения с содержимым регистров (пакетное чтение) и возвращает кортеж пар
+        (адрес регистра, значение) только для отличающихся регистров. Без записи.
+        config - слово конфигурации (используются только биты хоста, см. get_config_word);
+        thresholds - (Tmin, T_max) в raw-единицах; offset - смещение температуры в raw-единицах.
+        None - регистр не изменяется. Значения регистров совпадают с EEPROM сразу после включения питания
+        или программного сброса (см. program_eeprom)."""
+        TMP11X.check_eeprom_values(config, thresholds, offset)
+        r = self.read_registers(_EEPROM_CONFIG_REGS)
+        wanted = (None if config is None else config & _CONFIG_HOST_MASK,
+                  None if thresholds is None else thresholds[1] & _hex_FFFF,
+                  None if thresholds is None else thresholds[0] & _hex_FFFF,
+                  None if offset is None else offset & _hex_FFFF)
+        changes = []
+        for i in range(len(_EEPROM_CONFIG_REGS)):
+            value = wanted[i]
+            if value is None:
+                continue
+            current = r[i] & _CONFIG_HOST_MASK if 0 == i else r[i]
+            if current != value:
+                changes.append((_EEPROM_CONFIG_REGS[i], value))
+        return tuple(changes)
+
+    def program_eeprom_steps(self, config: int | None = None, thresholds: tuple[int, int] | None = None,
+                             offset: int | None = None, reload: bool = True, timeout_ms: int = 50):
+        """Генератор последовательности program_eeprom: выполняет обращения к шине и отдает паузы (мс),
+        которые выполняет вызывающий код (program_eeprom или AsyncTMP11X.program_eeprom).
+        Возвращает (StopIteration.value) количество запрограммированных регистров. Если генератор
+        не выполнен до конца, закройте его (close()): блок finally снимет разблокировку EEPROM."""
+        TMP11X.check_eeprom_values(config, thresholds, offset)
+        if reload:
+            self.soft_reset()
+            yield from self.wait_eeprom_steps(timeout_ms, _SOFT_RESET_TIME_MS)
+        changes = self.get_eeprom_changes(config, thresholds, offset)
+        if changes:
+            yield from self.wait_eeprom_steps(timeout_ms)
+            self.set_eeprom_unlock(True)
+            try:
+                for reg, value in changes:
+                    self.get_set_reg(addr=reg, format_value=None, value=value)
+                    yield from self.wait_eeprom_steps(timeout_ms, _EEPROM_PROG_TIME_MS)
+            finally:
+                self.set_eeprom_unlock(False)
+        self.get_config()
+        return len(changes)
+
+    def program_eeprom(self, config: int | None = None, thresholds: tuple[int, int] | None = None,
+                       offset: int | None = None, reload: bool = True, timeout_ms: int = 50) -> int:
+        """Записывает значения по умолчанию (при включении питания) в EEPROM датчика.
+        Программируются только регистры, значения которых отличаются от желаемых (см. get_eeprom_changes),
+        каждая ячейка EEPROM программируется ~7 мс и имеет ограниченный ресурс записи.
+        reload - перед сравнением выполнить программный сброс: регистры загружаются из EEPROM, поэтому
+        сравнение идет с содержимым EEPROM. Если Ложь, сравнение идет с текущими значениями регистров.
+        Внимание: сброс (reload=True) возвращает ВСЕ регистры к значениям из EEPROM, в том числе
+        не переданные в этот вызов: пороги, смещение и конфигурация, установленные во время работы,
+        теряются. После program_eeprom установите их заново (или сохраните заранее, см. get_snapshot).
+        Возвращает количество запрограммированных регистров. Поля экземпляра обновляются (get_config).
+        Последовательность (раздел 7.5.1.2 дата шита): EUN=1, запись регистров с ожиданием EEPROM_Busy, EUN=0.
+        Значения проверяются (check_eeprom_values) до сброса и разблокировки EEPROM."""
+        steps = self.program_eeprom_steps(config, thresholds, offset, reload, timeout_ms)
+        try:
+            while True:
+                time.sleep_ms(next(steps))
+        except StopIteration as e:
+            return e.value
+        finally:
+            steps.close()
+
     @micropython.native
     def get_conversion_cycle_time(self) -> int:
-        """Возвращает время преобразования температуры датчиком в миллисекундах(!) в зависимости от его настроек."""
-        conv = check_value(self.conversion_cycle_time, range(8),
-                        f"Invalid conversion cycle time value: {self.conversion_cycle_time}")
-        avg = check_value(self.average, range(4),
-                        f"Invalid conversion averaging mode value: {self.average}")
-        # В One-Shot режиме CONV игнорируется (раздел 7.4.3)
-        if 3 == self.conversion_mode:  # One-shot
-            return _AVG_MIN_CYCLE_MS[avg]
-        # запланированное время цикла из настроек CONV
-        base_time = _CONV_BASE_TIME_MS[conv]
-        # минимально необходимое время для выбранного усреднения AVG
-        min_required_time = _AVG_MIN_CYCLE_MS[avg]
-        # Реальное время = максимум из двух (общее время цикла не может быть меньше времени,
-        # которое физически требуется датчику на выполнение всех измерений для усреднения.)
-        return base_time if base_time > min_required_time else min_required_time
+        """Возвращает время преобразования температуры датчиком в миллисекундах(!) в зависимости от его настроек.
+        Время вычисляется (с проверкой настроек) только при изменении полей conversion_mode,
+        conversion_cycle_time или average, иначе возвращается запомненное значение."""
+        mode = self.conversion_mode
+        conv = self.conversion_cycle_time
+        avg = self.average
+        if mode != self._cct_mode or conv != self._cct_conv or avg != self._cct_avg:
+            self._cct = get_conversion_time_ms(mode, conv, avg)
+            self._cct_mode = mode
+            self._cct_conv = conv
+            self._cct_avg = avg
+        return self._cct
 
     def __del__(self):
+        if getattr(self, "_connection", None) is None:
+            return      # конструктор завершился исключением до обращения к шине (config и adopt)
         self.conversion_mode = 0x01     # Shutdown (SD)
         self.set_config()
         # del self._buf_2 # возвращаю несколько байт управляющему памятью:-)
@@ -181,6 +456,12 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
     def get_config(self) -> int:
         """Читает настройки датчика из регистра. Сохраняет(!) их в полях экземпляра класса."""
         raw_cfg = self._get_config_reg()
+        self._decode_config(raw_cfg)
+        return raw_cfg
+
+    @micropython.native
+    def _decode_config(self, raw_cfg: int):
+        """Заполняет поля экземпляра и теневую копию по значению регистра конфигурации, без обращения к шине"""
         self.DR_Alert = bool(raw_cfg & (0x01 << 2))
         self.POL = bool(raw_cfg & (0x01 << 3))
         self.T_nA = bool(raw_cfg & (0x01 << 4))
@@ -190,12 +471,18 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
         self.data_ready = bool(raw_cfg & (0x01 << 13))
         self.low_alert = bool(raw_cfg & (0x01 << 14))
         self.high_alert = bool(raw_cfg & (0x01 << 15))
-        #
-        return raw_cfg
+        self._cfg_shadow = raw_cfg & _CONFIG_HOST_MASK
 
     @micropython.native
-    def set_config(self):
-        """write current settings to sensor"""
+    def _get_shadow(self) -> int | None:
+        """Возвращает теневую копию битов конфигурации хоста или None, если кэш выключен/недействителен"""
+        if self.cache_config:
+            return self._cfg_shadow
+        return None
+
+    @micropython.native
+    def get_config_word(self) -> int:
+        """Возвращает значение регистра конфигурации, рассчитанное по полям экземпляра (без обращения к шине)"""
         raw_cfg = 0
         raw_cfg |= int(self.DR_Alert) << 2
         raw_cfg |= int(self.POL) << 3
@@ -203,16 +490,26 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
         raw_cfg |= int(self.average) << 5
         raw_cfg |= int(self.conversion_cycle_time) << 7
         raw_cfg |= int(self.conversion_mode) << 10
-        #
+        return raw_cfg
+
+    @micropython.native
+    def write_config_word(self, raw_cfg: int):
+        """Записывает заранее рассчитанное (get_config_word) значение регистра конфигурации одной транзакцией.
+        Поля экземпляра не изменяются, теневая копия конфигурации обновляется."""
         self._set_config_reg(raw_cfg)
+        self._cfg_shadow = raw_cfg & _CONFIG_HOST_MASK
+
+    @micropython.native
+    def set_config(self):
+        """write current settings to sensor"""
+        self.write_config_word(self.get_config_word())
 
     def start_measurement(self, single_shot: bool = False, conv_cycle_time: int = 4,
                           average_mode: int = 1):
         """Настраивает работу датчика в желаемом режиме.
         Вызывайте метод get_config для обновления конфигурации самостоятельно!"""
-        self.conversion_cycle_time = check_value(conv_cycle_time, range(8),
-                                                 f"Неверное значение параметра conversion_cycle_time: {conv_cycle_time}")
-        self.average = check_value(average_mode, range(4), f"Неверное значение параметра average_mode: {average_mode}")
+        self.conversion_cycle_time = check_range(conv_cycle_time, _CONV_RANGE, "conv_cycle_time")
+        self.average = check_range(average_mode, _AVG_RANGE, "average_mode")
         self.conversion_mode = 2    # continuous mode
         if single_shot:
             self.conversion_mode = 3
@@ -231,8 +528,15 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
 
     def get_temperature_offset(self) -> float:
         """get temperature offset from sensor"""
-        raw_offset = self.get_set_reg(addr=_REG_OFFSET, format_value="h")
-        return _raw_to_celsius(raw_offset)
+        return _raw_to_celsius(self.get_temperature_offset_raw())
+
+    def set_temperature_offset_raw(self, offset: int) -> int:
+        """Записывает смещение температуры в raw-единицах (1 LSB = 7.8125 m°C). Смотри set_temperature_offset!"""
+        return self.get_set_reg(addr=_REG_OFFSET, format_value=None, value=offset)
+
+    def get_temperature_offset_raw(self) -> int:
+        """Возвращает смещение температуры в raw-единицах (1 LSB = 7.8125 m°C)"""
+        return self.get_set_reg(addr=_REG_OFFSET, format_value="h")
 
     def get_id(self) -> id_tmp11X:
         """Возвращает идентификатор устройства TMP117, TMP119.
@@ -263,31 +567,66 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
         Если после вызова soft_reset есть свой код, требующий времени выполнения от 2 мс,
         то вызывать sleep_ms(2) не нужно. Этот код не должен работать с датчиком!
         sensor.get_config() вызвать все таки желательно!
+        При включенном кэше конфигурации (cache_config) регистр перед записью не читается.
+        После сброса датчик загружает конфигурацию из EEPROM, поэтому кэш становится недействительным.
         """
-        config = self._get_config_reg()
+        config = self._get_shadow()
+        if config is None:
+            config = self._get_config_reg()
         self._set_config_reg(config | 0x02)
+        self._cfg_shadow = None
 
     def get_flags(self) -> flags_tmp11X:
-        """Return tuple: (EEPROM_Busy, Data_Ready, LOW_Alert) flags"""
+        """Return tuple: (EEPROM_Busy, Data_Ready, LOW_Alert, HIGH_Alert) flags.
+        Создает новый кортеж при каждом вызове. Для частого опроса используйте read_status!"""
         config = self._get_config_reg()
-        # print(f"config_reg: {hex(config)}")
-        _gen = (0 != (config & (0x01 << i)) for i in range(12, 16))
-        return flags_tmp11X(eeprom_busy=next(_gen), data_ready=next(_gen), low_alert=next(_gen), high_alert=next(_gen))
+        return flags_tmp11X(eeprom_busy=_test_bit(config, _EEPROM_BUSY_MASK),
+                            data_ready=_test_bit(config, _DATA_READY_MASK),
+                            low_alert=_test_bit(config, _LOW_ALERT_MASK),
+                            high_alert=_test_bit(config, _HIGH_ALERT_MASK))
 
+    @micropython.native
+    def read_status(self, flags: TMP11XFlags | None = None, buf: bytearray | None = None) -> int:
+        """Читает регистр конфигурации одной транзакцией и возвращает его значение (слово состояния).
+        Если flags не None, обновляет его поля на месте. Память не выделяется.
+        Биты: 15 - HIGH_Alert, 14 - LOW_Alert, 13 - Data_Ready, 12 - EEPROM_Busy.
+        buf - буфер (2 байта) для чтения, как в get_measurement_raw (для обработчиков micropython.schedule).
+        Внимание: чтение сбрасывает Data_Ready, а в режиме Alert и флаги HIGH/LOW Alert!"""
+        if buf is None:
+            raw = self._get_config_reg()
+        else:
+            raw = self._connection.read_reg_16_into(_REG_CONFIG, buf)
+        if flags is not None:
+            flags.update(raw)
+        return raw
+
+    @micropython.native
     def get_data_status(self, raw: bool = False) -> bool | int:
         """Флаг готовности данных. Этот флаг указывает, что преобразование завершено и регистр температуры
         может быть прочитан. Каждый раз, когда считывается регистр температуры или регистр конфигурации,
         этот бит сбрасывается!"""
+        config = self._get_config_reg()
         if raw:
-            return self._get_config_reg()
-        return self.get_flags().data_ready
+            return config
+        return _test_bit(config, _DATA_READY_MASK)
+
+    @micropython.native
+    def get_measurement_raw(self, buf: bytearray | None = None) -> int:
+        """Возвращает содержимое регистра температуры (int16, 1 LSB = 7.8125 m°C) без преобразования в °C.
+        -32768 (0x8000) означает, что преобразование ещё не завершено.
+        buf - буфер (2 байта) для чтения. Передайте собственный буфер, если метод вызывается из обработчика,
+        запланированного micropython.schedule, чтобы не испортить self._buf_2 основного кода."""
+        if buf is None:
+            buf = self._buf_2
+        return self._connection.read_reg_16_into(_REG_TEMP, buf, True)
 
     @micropython.native
     def get_measurement_value(self, value_index: int = 0) -> float | None:
-        """Возвращает последнее измеренное значение температуры в °C.
+        """Возвращает последнее измеренное значение температуры в формате output_format.
 
         Returns:
-            float: Температура в градусах Цельсия.
+            float: Температура в градусах Цельсия (OUT_CELSIUS, по умолчанию).
+            int: Температура в m°C (OUT_MILLICELSIUS) или raw-значение, 1 LSB = 7.8125 m°C (OUT_RAW).
             None: Если преобразование ещё не завершено (значение 0x8000/-32768).
 
         Note:
@@ -297,7 +636,12 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
         raw_val = self.get_set_reg(addr=_REG_TEMP, format_value="h")
         if -32768 == raw_val:
             return None
-        return _raw_to_celsius(raw_val)
+        fmt = self.output_format
+        if TMP11X.OUT_CELSIUS == fmt:
+            return _raw_to_celsius(raw_val)
+        if TMP11X.OUT_MILLICELSIUS == fmt:
+            return raw_to_millicelsius(raw_val)
+        return raw_val
 
     def __next__(self):
         """Удобное чтение температуры с помощью итератора"""
@@ -329,18 +673,24 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
         if self.is_eeprom_busy():
             raise RuntimeError("EEPROM занята, результат будет неверен!")
         # можно читать!
-        _gen = (self.get_set_reg(addr=adr, format_value="H") for adr in _UID_EEPROM_ADDR)
-        return uid_tmp11X(word_0=next(_gen), word_1=next(_gen), word_2=next(_gen))
+        r = self.read_registers(_UID_EEPROM_ADDR)
+        return uid_tmp11X(word_0=r[0], word_1=r[1], word_2=r[2])
 
     def is_single_shot_mode(self) -> bool:
         """Возвращает Истина, когда датчик находится в режиме однократных измерений,
         каждое из которых запускается методом start_measurement"""
+        shadow = self._get_shadow()
+        if shadow is not None:
+            return 3 == (shadow >> 10) & 0b11
         self.get_config()
         return 3 == self.conversion_mode
 
     def is_continuously_mode(self) -> bool:
         """Возвращает Истина, когда датчик находится в режиме многократных измерений,
         производимых автоматически. Процесс запускается методом start_measurement"""
+        shadow = self._get_shadow()
+        if shadow is not None:
+            return 0 == (shadow >> 10) & 0b01
         self.get_config()
         return self.conversion_mode in (0, 2)
 
@@ -368,14 +718,15 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
     def set_comp_mode(self, mode: int | None = None, active_alarm_level: bool = False) -> int:
         """Установить режим работы встроенного температурного компаратора. Смотри в comp_interface.py"""
         if mode is not None:
-            mode = check_value(mode, range(2),
-                               error_msg=f"Неверное значение mode: {mode}. Используйте CompMode.COMPARATOR или CompMode.INTERRUPT!")
+            # Используйте CompMode.COMPARATOR или CompMode.INTERRUPT!
+            mode = check_range(mode, _COMP_MODE_RANGE, "mode")
             # T/nA бит (бит 4): 1=Therm (режим 0), 0=Alert (режим 1)
             self.T_nA = (CompMode.COMPARATOR == mode)
             self.POL = active_alarm_level
             self.set_config()
 
-        self.get_config()
+        if self._get_shadow() is None:
+            self.get_config()
         # Возвращаем текущий режим
         return CompMode.COMPARATOR if self.T_nA else CompMode.INTERRUPT
 
@@ -424,15 +775,46 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
             self.get_set_reg(addr=_REG_THIGH, format_value=None, value=t_max_raw)  # T_HIGH
 
         # Чтение текущих порогов
-        t_low_raw = self.get_set_reg(addr=_REG_TLOW, format_value="h")  # signed
-        t_high_raw = self.get_set_reg(addr=_REG_THIGH, format_value="h")  # signed
+        r = self.read_registers(_THRESHOLD_REGS)
 
         # Конвертация обратно в градусы Цельсия
-        t_min = _raw_to_celsius(t_low_raw)
-        t_max = _raw_to_celsius(t_high_raw)
+        t_min = _raw_to_celsius(_to_signed16(r[0]))
+        t_max = _raw_to_celsius(_to_signed16(r[1]))
 
         return t_min, t_max
 
+    def set_thresholds_raw(self, thresholds: tuple[int, int] | None = None, read_back: bool = True,
+                           high_first: bool = False) -> tuple[int, int]:
+        """Аналог set_thresholds для целочисленных raw-значений (1 LSB = 7.8125 m°C), без float.
+        Для порогов в m°C используйте millicelsius_to_raw.
+
+        Аргументы:
+            thresholds (tuple[int, int] | None): (Tmin, T_max) в raw-единицах, Tmin < T_max обязательно!
+                Если None, возвращает текущие пороги без изменений.
+            read_back (bool): если Ложь, записанные пороги не читаются обратно и возвращаются как есть
+                (две транзакции вместо четырех, для частого перепрограммирования порогов).
+            high_first (bool): порядок записи. Между двумя записями в регистрах одновременно новый и старый
+                порог; чтобы на это время не получить Tmin > T_max (ложная тревога компаратора), при сдвиге
+                окна вверх записывайте сначала T_max (Истина), при сдвиге вниз - сначала Tmin (Ложь).
+
+        Возвращает:
+            tuple[int, int]: Текущие пороги (Tmin, T_max) в raw-единицах.
+        """
+        if thresholds is not None:
+            TMP11X._check_thresholds_raw(thresholds)
+            t_min, t_max = thresholds
+            if high_first:
+                self.get_set_reg(addr=_REG_THIGH, format_value=None, value=t_max)
+                self.get_set_reg(addr=_REG_TLOW, format_value=None, value=t_min)
+            else:
+                self.get_set_reg(addr=_REG_TLOW, format_value=None, value=t_min)
+                self.get_set_reg(addr=_REG_THIGH, format_value=None, value=t_max)
+            if not read_back:
+                return t_min, t_max
+
+        r = self.read_registers(_THRESHOLD_REGS)
+        return _to_signed16(r[0]), _to_signed16(r[1])
+
     @micropython.native
     def is_over_threshold(self) -> bool:
         """
@@ -454,6 +836,14 @@ class TMP11X(IBaseSensorEx, IDentifier, Iterator, ICompInterface):
         Warning:
             В режиме прерывания повторный вызов сразу после срабатывания
             может вернуть False (флаг уже сброшен чтением)!
+            При включенном кэше конфигурации (cache_config) поля настроек экземпляра не обновляются,
+            обновляются только флаги состояния (data_ready, low_alert, high_alert).
         """
-        self.get_config()
+        if self._get_shadow() is None:
+            self.get_config()
+            return self.high_alert
+        raw_cfg = self._get_config_reg()
+        self.data_ready = bool(raw_cfg & (0x01 << 13))
+        self.low_alert = bool(raw_cfg & (0x01 << 14))
+        self.high_alert = bool(raw_cfg & (0x01 << 15))
         return self.high_alert
\ No newline at end of file
@@ -0,0 +1,129 @@
+# micropython
+# MIT license
+"""Банк программных температурных порогов (зон) поверх единственного окна компаратора TMP117/TMP119.
+
+Аппаратный компаратор поддерживает одно окно [TLOW, THIGH]. ThresholdBank хранит до десятков границ
+(например: норма / предупреждение / авария для нескольких уровней) в отсортированном массиве array('h')
+raw-значений. n границ делят шкалу на n + 1 зон, зона k: от границы k - 1 (включительно) до границы k.
+    - classify(raw) - номер зоны отсчета двоичным поиском: O(log n), без выделения памяти;
+    - update(raw) - то же с гистерезисом: подъем в следующую зону происходит при достижении границы,
+      а возврат вниз - только когда raw опустится ниже границы на ее гистерезис. При смене зоны
+      аппаратные пороги перепрограммируются так, чтобы окно компаратора охватывало только текущую зону:
+      TLOW = нижняя граница - гистерезис, THIGH = верхняя граница - 1 (компаратор срабатывает при T > THIGH,
+      то есть при raw >= верхней границы, как и переход в следующую зону). Две записи регистров без чтения:
+      при подъеме сначала THIGH, при спуске сначала TLOW, поэтому TLOW < THIGH в любой момент.
+Поэтому вывод ALERT (см. tmp11Xalert.AlertEngine) разбудит MCU при выходе из текущей зоны, даже если MCU спит.
+
+Пример:
+    # 25, 30, 35, 40 °C, гистерезис 0.5 °C
+    bank = ThresholdBank(ts, [celsius * 128 for celsius in (25, 30, 35, 40)], hysteresis=64)
+    bank.update(ts.get_measurement_raw())     # начальная зона и пороги компаратора
+    ...
+    zone = bank.update(ts.get_measurement_raw())
+"""
+
+import micropython
+from array import array
+from tmp11Xtimod import TMP11X
+
+
+@micropython.native
+def _bisect(bounds, n: int, raw: int) -> int:
+    """Количество границ bounds[0..n-1], меньших или равных raw (номер зоны без гистерезиса)"""
+    lo = 0
+    hi = n
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if raw < bounds[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class ThresholdBank:
+    """Набор отсортированных границ температурных зон с гистерезисом и аппаратным окном текущей зоны"""
+
+    def __init__(self, sensor: TMP11X | None, bounds, hysteresis=0, on_change=None):
+        """sensor - драйвер датчика для перепрограммирования порогов компаратора или None (только классификация);
+        bounds - границы зон в raw-единицах (1 LSB = 7.8125 m°C), строго по возрастанию;
+        hysteresis - гистерезис возврата вниз, raw-единицы: одно значение для всех границ или по одному на границу;
+        on_change - функция f(old_zone, new_zone, raw), вызываемая при смене зоны, или None."""
+        n = len(bounds)
+        if n < 1:
+            raise ValueError("Нужна хотя бы одна граница!")
+        self._bounds = array("h", bounds)
+        if isinstance(hysteresis, int):
+            self._hyst = array("h", n * [hysteresis])
+        else:
+            self._hyst = array("h", hysteresis)
+        if len(self._hyst) != n:
+            raise ValueError(f"Количество значений гистерезиса ({len(self._hyst)}) не равно количеству границ ({n})!")
+        b = self._bounds
+        h = self._hyst
+        for k in range(n):
+            if h[k] < 0:
+                raise ValueError(f"Отрицательный гистерезис границы {k}: {h[k]}")
+            if k and b[k] <= b[k - 1]:
+                raise ValueError(f"Границы должны строго возрастать: {b[k - 1]}, {b[k]}")
+        self._n = n
+        self._sensor = sensor
+        if sensor is not None:
+            # окно каждой зоны должно быть не уже допустимого окна компаратора (3 x точность датчика)
+            min_window = TMP11X.THRESHOLD_RAW_WINDOW_MIN
+            for k in range(n + 1):
+                lo, hi = self.window(k)
+                if hi - lo < min_window:
+                    raise ValueError(f"Окно зоны {k} ({hi - lo} LSB) уже допустимого ({min_window} LSB)!")
+        self.on_change = on_change
+        # текущая зона или -1, если еще не определена
+        self.zone = -1
+        # количество перепрограммирований порогов компаратора
+        self.reprograms = 0
+
+    def __len__(self) -> int:
+        """Количество зон"""
+        return self._n + 1
+
+    def classify(self, raw: int) -> int:
+        """Номер зоны raw-значения без учета гистерезиса. O(log n), память не выделяется"""
+        return _bisect(self._bounds, self._n, raw)
+
+    def window(self, zone: int) -> tuple:
+        """Аппаратное окно (TLOW, THIGH) для зоны zone в raw-единицах: компаратор срабатывает при
+        raw < TLOW или raw > THIGH. Для крайних зон используется граница допустимого диапазона порогов."""
+        if zone:
+            lo = self._bounds[zone - 1] - self._hyst[zone - 1]
+            if lo < TMP11X.THRESHOLD_RAW_MIN:
+                lo = TMP11X.THRESHOLD_RAW_MIN
+        else:
+            lo = TMP11X.THRESHOLD_RAW_MIN
+        hi = self._bounds[zone] - 1 if zone < self._n else TMP11X.THRESHOLD_RAW_MAX
+        if hi > TMP11X.THRESHOLD_RAW_MAX:
+            hi = TMP11X.THRESHOLD_RAW_MAX
+        return lo, hi
+
+    @micropython.native
+    def update(self, raw: int) -> int:
+        """Учитывает отсчет raw и возвращает текущую зону с учетом гистерезиса.
+        При смене зоны вызывает on_change и перепрограммирует пороги компаратора.
+        Если зона не изменилась, память не выделяется и шина не используется."""
+        zone = self.zone
+        new = _bisect(self._bounds, self._n, raw)
+        if zone >= 0 and new < zone:
+            # спуск: каждая пройденная граница должна быть пересечена с запасом гистерезиса
+            b = self._bounds
+            h = self._hyst
+            while new < zone and raw < b[zone - 1] - h[zone - 1]:
+                zone -= 1
+            new = zone
+            zone = self.zone
+        if new == zone:
+            return zone
+        self.zone = new
+        if self._sensor is not None:
+            self._sensor.set_thresholds_raw(self.window(new), read_back=False, high_first=new > zone)
+            self.reprograms += 1
+        if self.on_change is not None:
+            self.on_change(zone, new, raw)
+        return new